@@ -1,16 +1,28 @@
+"""
+Password hashing and JWT bearer tokens.
+
+Tokens carry the user's ID, role and token version as claims. Every request checks the
+version and the current role against the database, through a short per-process cache,
+so a revocation, role change or deleted user takes effect on every worker within
+USER_STATE_CACHE_TTL seconds, and immediately on the worker that made the change.
+"""
 import os
+import threading
+import time
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from . import database
+from . import database, schemas
 
 # Configuration variables
 SECRET_KEY = os.getenv('SECRET_KEY', 'your_secret_key')
 ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1440 minutes for a full day
+# Seconds a user's role and token version are trusted before being read again
+USER_STATE_CACHE_TTL = float(os.getenv('USER_STATE_CACHE_TTL', '30'))
 
 # Password context for hashing and verifying
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
@@ -34,14 +46,71 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     if expires_delta is None:
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    expire = datetime.utcnow() + expires_delta
-    to_encode.update({'exp': expire})
+    issued_at = datetime.utcnow()
+    expire = issued_at + expires_delta
+    to_encode.update({'exp': expire, 'iat': issued_at})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+class UserStateCache:
+    """
+    Per-process cache of each user's current (username, role, token_version).
+
+    Entries expire after USER_STATE_CACHE_TTL seconds. Writers in this process drop the
+    user's entry with forget() after committing, other processes see the change once
+    their entry expires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[float, Optional[schemas.UserTokenState]]] = {}
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[schemas.UserTokenState]]:
+        """(hit, state); a hit with state None means the user does not exist."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None or time.monotonic() - entry[0] >= USER_STATE_CACHE_TTL:
+            return False, None
+        return True, entry[1]
+
+    def put(self, user_id: int, state: Optional[schemas.UserTokenState]):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), state)
+
+    def forget(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_state_cache = UserStateCache()
+
+
+def forget_user(user_id: int):
+    """Drop the cached state of a user whose role or token version just changed."""
+    user_state_cache.forget(user_id)
+
+
+async def _user_state(user_id: int) -> Optional[schemas.UserTokenState]:
+    hit, state = user_state_cache.get(user_id)
+    if not hit:
+        async with database.AsyncDatabase() as db:
+            state = await db.get_user_token_state(user_id=user_id)
+        user_state_cache.put(user_id, state)
+    return state
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Validate and decode the JWT token from the request to retrieve the current user.
+
+    The token is rejected when the user no longer exists or its token version is not the
+    user's current one. The role is taken from the user's current state, not the token.
+    Both are read through user_state_cache, so most requests need no database query;
+    misses are read through the async engine and hold no thread pool slot.
     """
     credentials_exception = HTTPException(
         status_code=401,
@@ -57,12 +126,17 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
 
-    # Initialize the database and retrieve the user
-    db = database.Database()
-    try:
-        user = db.get_user_by_username(username=username)
+    user_id = payload.get("user_id")
+    if user_id is None:
+        # Tokens issued before the user_id claim was added
+        async with database.AsyncDatabase() as db:
+            user = await db.get_user_by_username(username=username)
         if user is None:
             raise credentials_exception
-        return user
-    finally:
-        db.close()
+        user_id = user.user_id
+
+    state = await _user_state(user_id)
+    # Tokens issued before versioning count as version 0
+    if state is None or state.username != username or payload.get("ver", 0) != state.token_version:
+        raise credentials_exception
+    return schemas.User(user_id=user_id, username=state.username, role=state.role)
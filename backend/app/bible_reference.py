@@ -0,0 +1,115 @@
+# app/bible_reference.py
+import re
+from typing import NamedTuple, Optional
+
+from .enums import BibleBook
+
+
+class PassageRange(NamedTuple):
+    """
+    An inclusive verse range within one book.
+
+    `end_verse` is None when the range runs to the end of `end_chapter`.
+    """
+    book_name: str
+    start_chapter: int
+    start_verse: int
+    end_chapter: int
+    end_verse: Optional[int]
+
+    def contains(self, chapter: int, verse: int) -> bool:
+        if (chapter, verse) < (self.start_chapter, self.start_verse):
+            return False
+        if chapter > self.end_chapter:
+            return False
+        return chapter < self.end_chapter or self.end_verse is None or verse <= self.end_verse
+
+
+_BOOKS_BY_NAME = {book.value.lower(): book.value for book in BibleBook}
+
+# "Genesis 37", "Genesis 37-38", "Romans 3:28", "1 Samuel 3:1-10", "John 1:1-2:11"
+_REFERENCE_PATTERN = re.compile(
+    r"^\s*(?P<book>.+?)\s+(?P<start_chapter>\d+)(?::(?P<start_verse>\d+))?"
+    r"(?:\s*[-–]\s*(?:(?P<end_chapter>\d+):)?(?P<end>\d+))?\s*$"
+)
+
+
+def make_passage_range(
+    book_name: str,
+    start_chapter: int,
+    start_verse: Optional[int] = None,
+    end_chapter: Optional[int] = None,
+    end_verse: Optional[int] = None
+) -> PassageRange:
+    """
+    Build a range from reference parts, filling in what was left out.
+
+    Without a start verse the range covers whole chapters. With a start verse but no
+    end, it is that single verse.
+
+    :raises ValueError: If the range ends before it starts.
+    """
+    book_name = _BOOKS_BY_NAME.get(book_name.strip().lower(), book_name.strip())
+    if start_verse is None:
+        passage = PassageRange(book_name, start_chapter, 1, end_chapter or start_chapter, end_verse)
+    elif end_chapter is None and end_verse is None:
+        passage = PassageRange(book_name, start_chapter, start_verse, start_chapter, start_verse)
+    else:
+        passage = PassageRange(book_name, start_chapter, start_verse, end_chapter or start_chapter, end_verse)
+
+    if passage.end_chapter < passage.start_chapter or (
+        passage.end_chapter == passage.start_chapter
+        and passage.end_verse is not None
+        and passage.end_verse < passage.start_verse
+    ):
+        raise ValueError(f"Passage ends before it starts: {passage}")
+    return passage
+
+
+def parse_reference(reference: Optional[str]) -> Optional[PassageRange]:
+    """
+    Parse a reference such as "Romans 3:28" or "John 1:1-2:11".
+
+    Only the first reference of a list ("Genesis 1:1; 2:3") is used. Returns None when
+    the text is not a reference.
+    """
+    if not reference:
+        return None
+    match = _REFERENCE_PATTERN.match(re.split(r"[;,]", reference, maxsplit=1)[0])
+    if not match:
+        return None
+    start_chapter = int(match["start_chapter"])
+    start_verse = int(match["start_verse"]) if match["start_verse"] else None
+    end_chapter = int(match["end_chapter"]) if match["end_chapter"] else None
+    end_verse = None
+    if match["end"]:
+        if start_verse is None and end_chapter is None:
+            # "Genesis 37-38" spans chapters
+            end_chapter = int(match["end"])
+        else:
+            end_verse = int(match["end"])
+    try:
+        return make_passage_range(match["book"], start_chapter, start_verse, end_chapter, end_verse)
+    except ValueError:
+        return None
+
+
+def question_passage_range(question) -> Optional[PassageRange]:
+    """
+    The passage a question refers to.
+
+    Uses the structured bible_reference_* fields when the book and start chapter are
+    set, otherwise parses the free-text bible_reference.
+    """
+    if question.bible_reference_book and question.bible_reference_start_chapter:
+        try:
+            return make_passage_range(
+                BibleBook(question.bible_reference_book).value,
+                question.bible_reference_start_chapter,
+                question.bible_reference_start_verse,
+                question.bible_reference_end_chapter,
+                question.bible_reference_end_verse
+            )
+        except ValueError:
+            return None
+    return parse_reference(question.bible_reference)
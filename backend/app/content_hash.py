@@ -0,0 +1,37 @@
+# app/content_hash.py
+import hashlib
+import json
+
+
+def question_content_hash(
+    question_text: str,
+    option1: str,
+    option2: str,
+    option3: str,
+    option4: str,
+    correct_option: int,
+    bible_reference: str
+) -> str:
+    """
+    Stable SHA-256 of the fields that make up a question's content.
+
+    The section is left out on purpose: section IDs differ between deployments, and the
+    same question file has to hash the same on every one of them.
+
+    The init-db loaders compute the same hash with init-db/create_account/content_hash.py,
+    keep the two in sync.
+    """
+    canonical = json.dumps(
+        [
+            question_text.strip(),
+            option1.strip(),
+            option2.strip(),
+            option3.strip(),
+            option4.strip(),
+            int(correct_option),
+            (bible_reference or "").strip(),
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,183 @@
+# app/content_snapshot.py
+"""
+Process-wide, read-only snapshot of the quiz content: sections with their question
+counts, and questions with their answer keys.
+
+Read paths look up the current snapshot without taking a lock or touching the database.
+Writers commit first and then call refresh(), which builds a complete new snapshot and
+swaps it in with one reference assignment, so readers always see either the old or the
+new content, never a mix.
+
+Content written by another process, e.g. another worker or init-db/fast_load.py, is
+picked up by a periodic check in get() that compares row counts and highest IDs with
+the database, or straight away with POST /health/content-snapshot/refresh. Sections
+and questions are only ever inserted or retired, never edited in place, so the counts
+change with every write.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the snapshot against the database
+CONTENT_SNAPSHOT_CHECK_INTERVAL = float(os.getenv('CONTENT_SNAPSHOT_CHECK_INTERVAL', '30'))
+
+
+def _digest(parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _fingerprint(session: Session) -> tuple:
+    """Row counts and highest IDs of the sections and questions, read in two queries."""
+    section_count, last_section_id = session.query(
+        func.count(models.Section.section_id), func.max(models.Section.section_id)
+    ).one()
+    question_count, last_question_id, retired_count = session.query(
+        func.count(models.Question.question_id),
+        func.max(models.Question.question_id),
+        func.count(case((models.Question.is_retired == True, 1)))
+    ).one()
+    return section_count, last_section_id or 0, question_count, last_question_id or 0, retired_count
+
+
+class ContentSnapshot:
+    """One immutable version of the sections and questions."""
+
+    def __init__(self, version: int, sections: Tuple[schemas.Section, ...], questions: Tuple[schemas.Question, ...], retired_ids: frozenset):
+        self.version = version
+        self.built_at = time.time()
+        # Compared with _fingerprint() to detect writes made by other processes
+        self.fingerprint = (
+            len(sections),
+            max((section.section_id for section in sections), default=0),
+            len(questions),
+            max((question.question_id for question in questions), default=0),
+            len(retired_ids),
+        )
+        self.sections = sections
+        self.sections_by_id: Mapping[int, schemas.Section] = MappingProxyType(
+            {section.section_id: section for section in sections}
+        )
+        # Retired questions stay addressable by ID and gradable, but are not listed
+        self.questions_by_id: Mapping[int, schemas.Question] = MappingProxyType(
+            {question.question_id: question for question in questions}
+        )
+        self.active_questions = tuple(question for question in questions if question.question_id not in retired_ids)
+        by_section = defaultdict(list)
+        for question in self.active_questions:
+            by_section[question.section_id].append(question)
+        self.questions_by_section: Mapping[int, Tuple[schemas.Question, ...]] = MappingProxyType(
+            {section_id: tuple(section_questions) for section_id, section_questions in by_section.items()}
+        )
+
+        # Content digests for ETags. Unlike `version` they survive restarts and only
+        # change when the content they cover does.
+        self.sections_digest = _digest(section.json() for section in sections)
+        self.questions_digest = _digest(
+            [question.json() for question in questions] + [str(question_id) for question_id in sorted(retired_ids)]
+        )
+        self.section_question_digests: Mapping[int, str] = MappingProxyType({
+            section_id: _digest(question.json() for question in section_questions)
+            for section_id, section_questions in self.questions_by_section.items()
+        })
+
+    @classmethod
+    def build(cls, session: Session, version: int) -> "ContentSnapshot":
+        """Read every section and question in two queries."""
+        # populate_existing so objects already in the writer's session are re-read
+        rows = session.query(models.Question).populate_existing().order_by(models.Question.question_id).all()
+        questions = tuple(schemas.Question.from_orm(row) for row in rows)
+        retired_ids = frozenset(row.question_id for row in rows if row.is_retired)
+
+        counts = defaultdict(int)
+        for question in questions:
+            if question.question_id not in retired_ids:
+                counts[question.section_id] += 1
+        sections = tuple(
+            schemas.Section(
+                section_id=section.section_id,
+                name=section.name,
+                description=section.description,
+                total_questions=counts[section.section_id]
+            )
+            for section in session.query(models.Section).populate_existing().order_by(models.Section.section_id)
+        )
+        return cls(version, sections, questions, retired_ids)
+
+
+class ContentSnapshotHolder:
+    """
+    Holds the current ContentSnapshot.
+
+    get() is a plain attribute read, apart from the periodic staleness check. refresh()
+    is serialised, so the last snapshot to be swapped in was always built after the last
+    write committed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._checked_at = 0.0
+
+    def get(self, session: Session) -> ContentSnapshot:
+        """
+        The current snapshot, built from `session` if none has been built yet.
+
+        At most every CONTENT_SNAPSHOT_CHECK_INTERVAL seconds the snapshot is compared
+        with the database and rebuilt when another process has written since.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh(session)
+        now = time.monotonic()
+        if now - self._checked_at < CONTENT_SNAPSHOT_CHECK_INTERVAL:
+            return snapshot
+        self._checked_at = now
+        if _fingerprint(session) != snapshot.fingerprint:
+            logger.info("Content changed in the database, refreshing the content snapshot")
+            snapshot = self.refresh(session)
+        return snapshot
+
+    def refresh(self, session: Session) -> ContentSnapshot:
+        """Build a new snapshot from the database and swap it in."""
+        with self._lock:
+            start = time.perf_counter()
+            version = self._snapshot.version + 1 if self._snapshot is not None else 1
+            snapshot = ContentSnapshot.build(session, version)
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+        logger.info(
+            f"Content snapshot v{snapshot.version}: {len(snapshot.sections)} sections, "
+            f"{len(snapshot.active_questions)} questions, built in {time.perf_counter() - start:.3f}s"
+        )
+        return snapshot
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"version": None}
+        return {
+            "version": snapshot.version,
+            "built_at": snapshot.built_at,
+            "sections": len(snapshot.sections),
+            "questions": len(snapshot.active_questions),
+            "retired_questions": len(snapshot.questions_by_id) - len(snapshot.active_questions),
+        }
+
+
+content_snapshot = ContentSnapshotHolder()
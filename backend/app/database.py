@@ -1,21 +1,196 @@
 # database.py
+import logging
 import os
-from sqlalchemy import create_engine, func
+import threading
+import time
+from sqlalchemy import create_engine, event, func, insert, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from . import models, schemas, auth
-from typing import List, Optional
+from .content_hash import question_content_hash
+from .bible_reference import PassageRange, question_passage_range
+from .verse_store import verse_store
+from .verse_search import parse_query
+from .content_snapshot import content_snapshot
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 DATABASE_URL = os.getenv(
     'DATABASE_URL',
     'mysql+pymysql://your_db_user:your_db_password@db:3306/bible_trivia_db'
 )
 
-engine = create_engine(DATABASE_URL)
+# Connection pool tuning, shared by the sync and async engines
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # Keep below MySQL's wait_timeout
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    'mysql': 'aiomysql',
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+}
+
+
+def _async_database_url(url: str):
+    """Swap the sync driver in a database URL for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS.get(backend, parsed.get_driver_name())}")
+
+
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL') or _async_database_url(DATABASE_URL)
+
+
+# Rows per multi-row insert (and per commit) when bulk loading Bible verses
+BIBLE_BATCH_CHUNK_SIZE = int(os.getenv('BIBLE_BATCH_CHUNK_SIZE', '1000'))
+# Rows per multi-row insert when bulk creating questions
+QUESTION_BULK_CHUNK_SIZE = int(os.getenv('QUESTION_BULK_CHUNK_SIZE', '500'))
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input, for use with escape="\\"."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class PoolStatistics:
+    """
+    Running checkout and wait counters for one engine's connection pool.
+
+    A wait is a checkout that found every connection, overflow included, in use and had
+    to queue for one; ordinary checkouts and new connections are not counted as waits.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.waits += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def attach(self, engine):
+        """Register pool event listeners on a sync engine (or an async engine's sync_engine)."""
+        self.engine = engine
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            stats = {
+                "engine": self.name,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "waits": self.waits,
+                "avg_wait_ms": round(self.total_wait_seconds / self.waits * 1000, 3) if self.waits else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+        # Read the pool through the engine, dispose() replaces it
+        pool = self.engine.pool if self.engine is not None else None
+        if isinstance(pool, QueuePool):
+            stats.update(
+                pool_size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return stats
+
+
+def _instrumented_pool(pool_class, statistics: PoolStatistics):
+    """Subclass a QueuePool so the time spent waiting on an exhausted pool is recorded."""
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            # With unlimited overflow (-1) a checkout never queues
+            if self._max_overflow < 0 or self.checkedout() < self.size() + self._max_overflow:
+                return super()._do_get()
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                statistics.record_wait(time.perf_counter() - start)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def _engine_options(url, pool_class, statistics: PoolStatistics) -> dict:
+    # SQLite (used for local runs) manages its own single-file pool
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {}
+    return {
+        "poolclass": _instrumented_pool(pool_class, statistics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+sync_pool_statistics = PoolStatistics("sync")
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, QueuePool, sync_pool_statistics))
+sync_pool_statistics.attach(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_pool_statistics = PoolStatistics("async")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_engine_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_statistics)
+)
+async_pool_statistics.attach(async_engine.sync_engine)
+# Objects must stay readable after commit, outside of the greenlet that loaded them
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def pool_statistics() -> List[dict]:
+    """Return checkout and wait statistics for both connection pools."""
+    return [sync_pool_statistics.as_dict(), async_pool_statistics.as_dict()]
+
 class Database:
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        self.db: Session = session if session is not None else SessionLocal()
 
     def close(self):
         self.db.close()
@@ -44,17 +219,65 @@ class Database:
         self.db.add(db_user)
         self.db.commit()
         self.db.refresh(db_user)
+        # The ID may have belonged to a deleted user whose absence is still cached
+        auth.forget_user(db_user.user_id)
         
         return db_user
+
+    def update_user_role(self, user_id: int, role: schemas.Role):
+        """
+        Change a user's role.
+
+        Requests take the role from the user's current state rather than the token, so
+        existing tokens follow the change; see auth.get_current_user.
+
+        :return: The updated user, or None if the user does not exist.
+        """
+        db_user = self.get_user(user_id)
+        if db_user is None:
+            return None
+        if db_user.role != role:
+            db_user.role = role
+            self.db.commit()
+            auth.forget_user(user_id)
+        self.db.refresh(db_user)
+        return db_user
+
+    def revoke_user_tokens(self, user_id: int) -> bool:
+        """
+        Reject every token issued to the user so far by bumping their token version.
+
+        :return: False if the user does not exist.
+        """
+        revoked = self.db.query(models.User).filter(models.User.user_id == user_id).update(
+            {models.User.token_version: models.User.token_version + 1}, synchronize_session=False
+        )
+        self.db.commit()
+        auth.forget_user(user_id)
+        return bool(revoked)
+
+    def get_user_token_state(self, user_id: int) -> Optional[schemas.UserTokenState]:
+        """The username, role and token version a token of the user is checked against."""
+        row = self.db.query(models.User.username, models.User.role, models.User.token_version).filter(
+            models.User.user_id == user_id
+        ).first()
+        if row is None:
+            return None
+        return schemas.UserTokenState(username=row.username, role=row.role, token_version=row.token_version)
     
     
     # ---------------- Section Methods ----------------
 
-    def get_sections(self):
-        return self.db.query(models.Section).all()
+    def get_sections(self) -> List[schemas.Section]:
+        """Retrieve all sections with their counts of active questions, from the content snapshot."""
+        return list(content_snapshot.get(self.db).sections)
 
-    def get_section(self, section_id: int):
-        return self.db.query(models.Section).filter(models.Section.section_id == section_id).first()
+    def get_section(self, section_id: int) -> Optional[schemas.Section]:
+        return content_snapshot.get(self.db).sections_by_id.get(section_id)
+
+    def get_sections_digest(self) -> str:
+        """Digest of the sections list, for ETags."""
+        return content_snapshot.get(self.db).sections_digest
 
     def create_section(self, section: schemas.SectionCreate):
         db_section = models.Section(
@@ -63,6 +286,7 @@ class Database:
         )
         self.db.add(db_section)
         self.db.commit()
+        content_snapshot.refresh(self.db)
         self.db.refresh(db_section)
         return db_section
 
@@ -72,61 +296,243 @@ class Database:
         self, 
         section_id: int, 
         difficulty: Optional[str] = None
-    ) -> List[models.Question]:
-        """Retrieve questions by section with optional difficulty filtering."""
-        query = self.db.query(models.Question).filter(models.Question.section_id == section_id)
+    ) -> List[schemas.Question]:
+        """Retrieve active questions by section with optional difficulty filtering."""
+        questions = content_snapshot.get(self.db).questions_by_section.get(section_id, ())
         if difficulty:
-            query = query.filter(models.Question.difficulty == difficulty)
-        return query.all()
+            return [question for question in questions if question.difficulty == difficulty]
+        return list(questions)
+
+    @staticmethod
+    def _question_values(question: schemas.QuestionCreate) -> dict:
+        """Column values for a new Question row."""
+        return {
+            "section_id": question.section_id,
+            "question_text": question.question_text,
+            "option1": question.option1,
+            "option2": question.option2,
+            "option3": question.option3,
+            "option4": question.option4,
+            "correct_option": question.correct_option,
+            "bible_reference": question.bible_reference,
+            "bible_text": question.bible_text,
+            "difficulty": question.difficulty,  # Now required
+            "topic": question.topic,  # Now required
+            "tags": question.tags,  # JSON field
+            "hint": question.hint,
+            "bible_reference_book": question.bible_reference_book,
+            "bible_reference_start_chapter": question.bible_reference_start_chapter,
+            "bible_reference_end_chapter": question.bible_reference_end_chapter,
+            "bible_reference_start_verse": question.bible_reference_start_verse,
+            "bible_reference_end_verse": question.bible_reference_end_verse,
+            "content_hash": question_content_hash(
+                question_text=question.question_text,
+                option1=question.option1,
+                option2=question.option2,
+                option3=question.option3,
+                option4=question.option4,
+                correct_option=question.correct_option,
+                bible_reference=question.bible_reference
+            )
+        }
 
     def create_question(self, question: schemas.QuestionCreate):
-        db_question = models.Question(
-            section_id=question.section_id,
-            question_text=question.question_text,
-            option1=question.option1,
-            option2=question.option2,
-            option3=question.option3,
-            option4=question.option4,
-            correct_option=question.correct_option,
-            bible_reference=question.bible_reference,
-            bible_text=question.bible_text,
-            difficulty=question.difficulty,  # Now required
-            topic=question.topic,  # Now required
-            tags=question.tags,  # JSON field
-            hint=question.hint,
-            bible_reference_book=question.bible_reference_book,
-            bible_reference_start_chapter=question.bible_reference_start_chapter,
-            bible_reference_end_chapter=question.bible_reference_end_chapter,
-            bible_reference_start_verse=question.bible_reference_start_verse,
-            bible_reference_end_verse=question.bible_reference_end_verse
-        )
+        db_question = models.Question(**self._question_values(question))
         self.db.add(db_question)
         self.db.commit()
+        content_snapshot.refresh(self.db)
         self.db.refresh(db_question)
         return db_question
+
+    def bulk_create_questions(
+        self,
+        questions: List[schemas.QuestionCreate],
+        chunk_size: int = QUESTION_BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Validate and insert many questions in one transaction.
+
+        The whole payload is validated before anything is written. Rows are then sent in
+        multi-row inserts of `chunk_size` and committed together, so a failure leaves
+        no question of the payload behind.
+
+        :param questions: The questions to create.
+        :param chunk_size: Number of rows per insert statement.
+        :return: The assigned question IDs, in payload order.
+        :raises ValueError: If any question is invalid, listing every problem found.
+        """
+        if not questions:
+            return []
+
+        section_ids = {question.section_id for question in questions}
+        known_section_ids = {
+            section_id for (section_id,) in self.db.query(models.Section.section_id).filter(
+                models.Section.section_id.in_(list(section_ids))
+            )
+        }
+        errors = []
+        for index, question in enumerate(questions):
+            if question.section_id not in known_section_ids:
+                errors.append(f"Question {index}: section {question.section_id} does not exist")
+            if question.correct_option not in (1, 2, 3, 4):
+                errors.append(f"Question {index}: correct_option must be between 1 and 4")
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        table = models.Question.__table__
+        dialect = self.db.get_bind().dialect
+        question_ids = []
+        try:
+            for start in range(0, len(questions), chunk_size):
+                rows = [self._question_values(question) for question in questions[start:start + chunk_size]]
+                if dialect.insert_executemany_returning:
+                    result = self.db.execute(
+                        insert(table).returning(table.c.question_id, sort_by_parameter_order=True),
+                        rows
+                    )
+                    question_ids.extend(result.scalars().all())
+                else:
+                    # MySQL has no RETURNING, and ids of a multi-row INSERT are only
+                    # consecutive under some auto-increment lock modes. lastrowid is the
+                    # lowest id of the chunk, so read the rows back by content from there.
+                    result = self.db.execute(insert(table).values(rows))
+                    question_ids.extend(self._inserted_question_ids(rows, first_question_id=result.lastrowid))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        content_snapshot.refresh(self.db)
+        return question_ids
     
-    def get_question(self, question_id: int) -> Optional[models.Question]:
+    def _inserted_question_ids(self, rows: List[dict], first_question_id: int) -> List[int]:
+        """
+        IDs of question rows just inserted, for dialects without RETURNING.
+
+        :param rows: The inserted column values, as built by _question_values.
+        :param first_question_id: The lowest ID assigned by the insert.
+        :return: The question IDs, in the order of `rows`.
+        """
+        keys = {(row["section_id"], row["content_hash"]) for row in rows}
+        ids_by_key: Dict[tuple, List[int]] = {}
+        for question_id, section_id, content_hash in self.db.query(
+            models.Question.question_id, models.Question.section_id, models.Question.content_hash
+        ).filter(
+            models.Question.question_id >= first_question_id,
+            tuple_(models.Question.section_id, models.Question.content_hash).in_(list(keys))
+        ).order_by(models.Question.question_id):
+            ids_by_key.setdefault((section_id, content_hash), []).append(question_id)
+
+        # Rows repeated within the payload were inserted in payload order, take their IDs in turn
+        question_ids = []
+        for row in rows:
+            key_ids = ids_by_key.get((row["section_id"], row["content_hash"]))
+            if not key_ids:
+                raise RuntimeError(f"Inserted question in section {row['section_id']} could not be read back")
+            question_ids.append(key_ids.pop(0))
+        return question_ids
+
+    def get_question(self, question_id: int) -> Optional[schemas.Question]:
         """Retrieve a question by its ID."""
-        return self.db.query(models.Question).filter(models.Question.question_id == question_id).first()
+        return content_snapshot.get(self.db).questions_by_id.get(question_id)
+
+    def get_all_questions(self) -> List[schemas.Question]:
+        """Retrieve all questions that have not been retired."""
+        return list(content_snapshot.get(self.db).active_questions)
+
+    def get_questions_digest(self, section_id: Optional[int] = None) -> str:
+        """Digest of one section's active questions, or of every question, for ETags."""
+        snapshot = content_snapshot.get(self.db)
+        if section_id is None:
+            return snapshot.questions_digest
+        return snapshot.section_question_digests.get(section_id, "")
+
+    def get_question_hashes(self) -> List[schemas.QuestionKey]:
+        """Retrieve the section and content hash of all questions that have not been retired."""
+        return [
+            schemas.QuestionKey(section_id=section_id, content_hash=content_hash)
+            for section_id, content_hash in self.db.query(models.Question.section_id, models.Question.content_hash).filter(
+                models.Question.is_retired == False,
+                models.Question.content_hash.isnot(None)
+            )
+        ]
+
+    def retire_questions(self, keys: List[schemas.QuestionKey]) -> int:
+        """
+        Retire the active questions with the given section and content hash.
 
-    def get_all_questions(self) -> List[models.Question]:
-        """Retrieve all questions in the database."""
-        return self.db.query(models.Question).all()
+        Retired questions keep their progress history but are no longer served. The same
+        content in other sections is left alone.
+
+        :param keys: Section and content hash of the questions to retire.
+        :return: The number of questions retired.
+        """
+        if not keys:
+            return 0
+        retired = self.db.query(models.Question).filter(
+            tuple_(models.Question.section_id, models.Question.content_hash).in_(
+                [(key.section_id, key.content_hash) for key in keys]
+            ),
+            models.Question.is_retired == False
+        ).update({models.Question.is_retired: True}, synchronize_session=False)
+        self.db.commit()
+        content_snapshot.refresh(self.db)
+        return retired
+
+    def backfill_question_hashes(self, batch_size: int = 500) -> int:
+        """
+        Set the content hash of every question whose stored hash is missing or was
+        computed by an older version of question_content_hash.
+
+        :param batch_size: Number of questions checked per commit.
+        :return: The number of questions updated.
+        """
+        updated = 0
+        last_question_id = 0
+        while True:
+            questions = self.db.query(models.Question).filter(
+                models.Question.question_id > last_question_id
+            ).order_by(models.Question.question_id).limit(batch_size).all()
+            if not questions:
+                return updated
+            for question in questions:
+                content_hash = question_content_hash(
+                    question_text=question.question_text,
+                    option1=question.option1,
+                    option2=question.option2,
+                    option3=question.option3,
+                    option4=question.option4,
+                    correct_option=question.correct_option,
+                    bible_reference=question.bible_reference
+                )
+                if question.content_hash != content_hash:
+                    question.content_hash = content_hash
+                    updated += 1
+            self.db.commit()
+            last_question_id = questions[-1].question_id
     
     
     # ---------------- Score Methods ----------------
 
     def create_score(self, score: schemas.ScoreCreate, user_id: int):
-        """Create a new score entry for a user."""
-        db_score = models.Score(
-            user_id=user_id,
-            section_id=score.section_id,
-            attempt_number=score.attempt_number,
-            score=score.score,
-            time_taken=score.time_taken
-        )
-        self.db.add(db_score)
-        self.db.commit()
+        """
+        Create a new score entry for a user and add it to the leaderboard totals.
+
+        The attempt number is allocated by the server; `score.attempt_number` is ignored.
+        """
+        try:
+            db_score = models.Score(
+                user_id=user_id,
+                section_id=score.section_id,
+                attempt_number=self._next_attempt_number(user_id=user_id, section_id=score.section_id),
+                score=score.score,
+                time_taken=score.time_taken
+            )
+            self.db.add(db_score)
+            self._add_to_leaderboard_totals(user_id=user_id, section_id=score.section_id, points=score.score)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         self.db.refresh(db_score)
         return db_score
 
@@ -138,20 +544,75 @@ class Database:
         """Retrieve all scores for a specific section."""
         return self.db.query(models.Score).filter(models.Score.section_id == section_id).all()
 
+    def get_user_section_score_summaries(self, user_id: int) -> Dict[int, dict]:
+        """
+        Latest score, best score and number of attempts per section for one user.
+
+        One windowed query over the user's scores, returning a row per section rather
+        than per attempt. The latest score is the one with the highest attempt_number.
+
+        :return: Mapping of section_id to {"latest_score", "best_score", "attempts"}.
+        """
+        ranked = select(
+            models.Score.section_id,
+            models.Score.score,
+            func.row_number().over(
+                partition_by=models.Score.section_id,
+                order_by=(models.Score.attempt_number.desc(), models.Score.score_id.desc())
+            ).label("recency"),
+            func.max(models.Score.score).over(partition_by=models.Score.section_id).label("best_score"),
+            func.count().over(partition_by=models.Score.section_id).label("attempts")
+        ).where(models.Score.user_id == user_id).subquery()
+        rows = self.db.execute(
+            select(ranked.c.section_id, ranked.c.score, ranked.c.best_score, ranked.c.attempts)
+            .where(ranked.c.recency == 1)
+        )
+        return {
+            section_id: {"latest_score": score, "best_score": best_score, "attempts": attempts}
+            for section_id, score, best_score, attempts in rows
+        }
+
+    def get_dashboard(self, user_id: int) -> schemas.Dashboard:
+        """
+        Sections with their question counts, from the content snapshot, merged with the
+        user's per-section score summary.
+        """
+        summaries = self.get_user_section_score_summaries(user_id)
+        sections = [
+            schemas.DashboardSection(**section.dict(), **summaries.get(section.section_id, {}))
+            for section in content_snapshot.get(self.db).sections
+        ]
+        completed_sections = sum(1 for section in sections if section.attempts)
+        return schemas.Dashboard(
+            sections=sections,
+            total_sections=len(sections),
+            completed_sections=completed_sections,
+            remaining_sections=len(sections) - completed_sections
+        )
+
     def get_user_section_attempts_count(self, user_id: int, section_id: int) -> int:
         """
-        Get the number of attempts made by the user for the given section based on the highest attempt_number.
+        Get the number of attempts made by the user for the given section, i.e. the
+        highest attempt_number handed out. A primary key read of the attempt counter.
         """
-        # Query the maximum attempt_number for the user and section
-        max_attempt = self.db.query(func.max(models.Score.attempt_number)).filter(
-            models.Score.user_id == user_id,
-            models.Score.section_id == section_id
+        attempts = self.db.query(models.SectionUserAttempt.attempts).filter(
+            models.SectionUserAttempt.user_id == user_id,
+            models.SectionUserAttempt.section_id == section_id
         ).scalar()
-        
-        print("MAX!!: ", max_attempt)
+        return attempts if attempts is not None else 0
 
-        # If no attempts are found, return 0; otherwise return the max_attempt
-        return max_attempt if max_attempt is not None else 0
+    def _next_attempt_number(self, user_id: int, section_id: int) -> int:
+        """
+        Bump the user's attempt counter for the section and return the new value.
+
+        The upsert holds the counter row's lock until the transaction ends, so
+        concurrent attempts get distinct numbers. Does not commit.
+        """
+        self._increment(models.SectionUserAttempt, {"section_id": section_id, "user_id": user_id}, "attempts", 1)
+        return self.db.query(models.SectionUserAttempt.attempts).filter(
+            models.SectionUserAttempt.user_id == user_id,
+            models.SectionUserAttempt.section_id == section_id
+        ).scalar()
 
     
     # ---------------- Bible Verse Methods ----------------
@@ -175,16 +636,178 @@ class Database:
         )
         self.db.add(db_verse)
         self.db.commit()
+        verse_store.invalidate()
         self.db.refresh(db_verse)
         return db_verse
     
+    def _insert_ignore(self, model):
+        """An INSERT for `model` that silently skips rows violating a unique key."""
+        table = model.__table__
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'mysql':
+            return mysql.insert(table).prefix_with('IGNORE')
+        if dialect == 'postgresql':
+            return postgresql.insert(table).on_conflict_do_nothing()
+        return sqlite.insert(table).on_conflict_do_nothing()
+
+    def bulk_create_bible_verses(
+        self,
+        verses: List[schemas.BibleVerseCreate],
+        chunk_size: int = BIBLE_BATCH_CHUNK_SIZE
+    ) -> int:
+        """
+        Insert Bible verses in chunks, skipping ones that already exist.
+
+        For each chunk the existing (book_name, chapter, verse, version) keys are found
+        with one query and the remaining verses are written with one multi-row insert
+        and one commit. The insert ignores unique-key conflicts, so concurrent loaders
+        of the same verses cannot fail each other.
+
+        :param verses: The verses to insert. Duplicates within the list are ignored.
+        :param chunk_size: Number of verses per query, insert and commit.
+        :return: The number of verses inserted.
+        """
+        created = 0
+        seen = set()
+        try:
+            for start in range(0, len(verses), chunk_size):
+                rows = {}
+                for verse in verses[start:start + chunk_size]:
+                    key = (verse.book_name, verse.chapter, verse.verse, verse.version)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    rows[key] = {
+                        "book_name": verse.book_name,
+                        "chapter": verse.chapter,
+                        "verse": verse.verse,
+                        "text": verse.text,
+                        "version": verse.version
+                    }
+                if not rows:
+                    continue
+
+                existing = set(
+                    tuple(row) for row in self.db.query(
+                        models.BibleVerse.book_name,
+                        models.BibleVerse.chapter,
+                        models.BibleVerse.verse,
+                        models.BibleVerse.version
+                    ).filter(
+                        tuple_(
+                            models.BibleVerse.book_name,
+                            models.BibleVerse.chapter,
+                            models.BibleVerse.verse,
+                            models.BibleVerse.version
+                        ).in_(list(rows.keys()))
+                    ).all()
+                )
+                new_rows = [row for key, row in rows.items() if key not in existing]
+                if not new_rows:
+                    continue
+
+                try:
+                    self.db.execute(self._insert_ignore(models.BibleVerse), new_rows)
+                    self.db.commit()
+                except Exception:
+                    self.db.rollback()
+                    raise
+                created += len(new_rows)
+        finally:
+            # One rebuild for the whole batch, even if a later chunk failed
+            if created:
+                verse_store.invalidate()
+
+        return created
+
     def get_bible_verses_for_section(self, section_id: int) -> List[str]:
         """Retrieve all Bible verses associated with a specific section."""
         # Assuming each question in a section has a bible_text or bible_reference
-        questions = self.db.query(models.Question).filter(models.Question.section_id == section_id).all()
+        questions = self.db.query(models.Question).filter(
+            models.Question.section_id == section_id,
+            models.Question.is_retired == False
+        ).all()
         bible_verses = list({q.bible_text for q in questions if q.bible_text})
         return bible_verses
     
+    @staticmethod
+    def _passage_filter(passage: PassageRange):
+        """WHERE clause matching the verses of one passage, a range on the verse key index."""
+        condition = (
+            (models.BibleVerse.book_name == passage.book_name)
+            & models.BibleVerse.chapter.between(passage.start_chapter, passage.end_chapter)
+            & ((models.BibleVerse.chapter > passage.start_chapter) | (models.BibleVerse.verse >= passage.start_verse))
+        )
+        if passage.end_verse is not None:
+            condition = condition & (
+                (models.BibleVerse.chapter < passage.end_chapter) | (models.BibleVerse.verse <= passage.end_verse)
+            )
+        return condition
+
+    def _read_passages(self, passages, version: str) -> Dict[PassageRange, List[schemas.BibleVerse]]:
+        """
+        Every verse of each passage, in reading order.
+
+        Passages are read from the verse store. Those it has no verses for, and all of
+        them when it is not loaded, are fetched together in a single query. If the
+        database has verses the store lacks, the store predates them and is rebuilt.
+        """
+        store = verse_store.current(self.db)
+        verses_by_passage = {}
+        if store is not None:
+            verses_by_passage = {passage: store.get_passage(passage, version) for passage in passages}
+        missing = [passage for passage in passages if not verses_by_passage.get(passage)]
+        if missing:
+            verses = self.db.query(models.BibleVerse).filter(
+                models.BibleVerse.version == version,
+                or_(*(self._passage_filter(passage) for passage in missing))
+            ).order_by(models.BibleVerse.book_name, models.BibleVerse.chapter, models.BibleVerse.verse).all()
+            for passage in missing:
+                verses_by_passage[passage] = [
+                    schemas.BibleVerse.from_orm(verse) for verse in verses
+                    if verse.book_name == passage.book_name and passage.contains(verse.chapter, verse.verse)
+                ]
+            if store is not None and verses:
+                logger.warning("Verse store is missing verses the database has, rebuilding it")
+                verse_store.invalidate()
+        return verses_by_passage
+
+    def get_bible_passage(self, passage: PassageRange, version: str) -> List[schemas.BibleVerse]:
+        """Retrieve every verse of a passage, in reading order."""
+        return self._read_passages([passage], version)[passage]
+
+    def get_question_passages(self, section_id: int, version: str) -> List[schemas.QuestionPassage]:
+        """
+        Resolve the passage of every active question in a section.
+
+        The distinct passages are read together, see _read_passages, and then handed out
+        to the questions.
+
+        :param section_id: The section whose questions to resolve.
+        :param version: The translation to read, e.g. "KJV".
+        :return: One entry per question, with `passage` None when it has no usable reference.
+        """
+        questions = self.db.query(models.Question).filter(
+            models.Question.section_id == section_id,
+            models.Question.is_retired == False
+        ).order_by(models.Question.question_id).all()
+        ranges = {question.question_id: question_passage_range(question) for question in questions}
+
+        passages = set(passage for passage in ranges.values() if passage is not None)
+        verses_by_passage = self._read_passages(passages, version)
+        return [
+            schemas.QuestionPassage(
+                question_id=question.question_id,
+                bible_reference=question.bible_reference,
+                passage=None if ranges[question.question_id] is None else schemas.BiblePassage(
+                    **ranges[question.question_id]._asdict(),
+                    version=version,
+                    verses=verses_by_passage[ranges[question.question_id]]
+                )
+            )
+            for question in questions
+        ]
+
     def get_bible_verse_by_details(self, book_name: str, chapter: int, verse: int, version: str):
         """Retrieve a specific Bible verse by book name, chapter, verse, and version."""
         return self.db.query(models.BibleVerse).filter(
@@ -194,13 +817,132 @@ class Database:
             models.BibleVerse.version == version
         ).first()
 
+    def search_bible_verses(
+        self,
+        query: str,
+        version: Optional[str] = None,
+        book_name: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> schemas.BibleSearchResult:
+        """
+        Full-text search over verse text, best matches first.
+
+        Served from the verse store's inverted index. Without a loaded, current store it
+        falls back to an unranked LIKE scan of the table.
+
+        :param query: Words and "quoted phrases", all of which must match.
+        :param version: Only verses of this translation.
+        :param book_name: Only verses of this book.
+        :param offset: Number of matches to skip.
+        :param limit: Maximum number of matches to return.
+        :return: The total number of matches and the requested page.
+        """
+        store = verse_store.current(self.db)
+        if store is not None:
+            total, matches = store.search_index.search(
+                query, version=version, book_name=book_name, offset=offset, limit=limit
+            )
+            hits = [schemas.BibleSearchHit(verse=store.verse_at(row), score=score) for row, score in matches]
+        else:
+            filtered = self.db.query(models.BibleVerse)
+            for clause in parse_query(query):
+                filtered = filtered.filter(
+                    models.BibleVerse.text.ilike(f"%{_escape_like(' '.join(clause))}%", escape="\\")
+                )
+            if version is not None:
+                filtered = filtered.filter(models.BibleVerse.version == version)
+            if book_name is not None:
+                filtered = filtered.filter(models.BibleVerse.book_name == book_name)
+            total = filtered.count()
+            hits = [
+                schemas.BibleSearchHit(verse=schemas.BibleVerse.from_orm(verse))
+                for verse in filtered.order_by(models.BibleVerse.verse_id).offset(offset).limit(limit)
+            ]
+        return schemas.BibleSearchResult(query=query, total=total, offset=offset, limit=limit, hits=hits)
+
+    def get_verse_store_digest(self) -> Optional[str]:
+        """Digest of the loaded verse store, None while verses are served from the database."""
+        store = verse_store.current(self.db)
+        return store.digest if store is not None else None
+
+    def lookup_bible_verse(self, verse_id: int):
+        """
+        Read a Bible verse by ID, from the in-process verse store when it is loaded.
+
+        IDs the store does not have are looked up in the database, and a hit there
+        means the store predates the verse, so it is rebuilt.
+        """
+        store = verse_store.current(self.db)
+        if store is not None:
+            verse = store.get_by_id(verse_id)
+            if verse is not None:
+                return verse
+        verse = self.get_bible_verse_by_id(verse_id)
+        if store is not None and verse is not None:
+            logger.warning(f"Verse {verse_id} is missing from the verse store, rebuilding it")
+            verse_store.invalidate()
+        return verse
+
     def get_bible_verse_by_id(self, verse_id: int):
         """Retrieve a Bible verse by its unique ID."""
         return self.db.query(models.BibleVerse).filter(models.BibleVerse.verse_id == verse_id).first()
 
-    def get_bible_verses(self, skip: int = 0, limit: int = 100) -> List[models.BibleVerse]:
-        """Retrieve a list of Bible verses with pagination."""
-        return self.db.query(models.BibleVerse).offset(skip).limit(limit).all()
+    def get_bible_verses(
+        self,
+        after_verse_id: Optional[int] = None,
+        limit: int = 100,
+        skip: int = 0,
+        version: Optional[str] = None,
+        book_name: Optional[str] = None,
+        chapter: Optional[int] = None
+    ) -> List[models.BibleVerse]:
+        """
+        Retrieve a page of Bible verses in verse_id order, optionally filtered.
+
+        Pages are keyed on verse_id rather than an offset, so every page is an index
+        range read no matter how deep the reader is. Verses are loaded in reading
+        order, which makes verse_id order the reading order within a translation.
+
+        :param after_verse_id: Return only verses after this ID, from the previous page.
+        :param limit: Maximum number of verses to return.
+        :param skip: Rows to skip first, for clients still paging by offset.
+        :param version: Only verses of this translation, e.g. "KJV".
+        :param book_name: Only verses of this book.
+        :param chapter: Only verses of this chapter.
+        :return: Up to `limit` verses.
+        """
+        query = self._bible_verses_query(after_verse_id, version, book_name, chapter)
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+
+    def iter_bible_verses(
+        self,
+        after_verse_id: Optional[int] = None,
+        version: Optional[str] = None,
+        book_name: Optional[str] = None,
+        chapter: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[models.BibleVerse]:
+        """
+        Yield every matching verse in verse_id order, reading `batch_size` rows at a time
+        from a server-side cursor. The session's connection stays busy until the
+        generator is exhausted or closed.
+        """
+        yield from self._bible_verses_query(after_verse_id, version, book_name, chapter).yield_per(batch_size)
+
+    def _bible_verses_query(self, after_verse_id, version, book_name, chapter):
+        query = self.db.query(models.BibleVerse)
+        if version is not None:
+            query = query.filter(models.BibleVerse.version == version)
+        if book_name is not None:
+            query = query.filter(models.BibleVerse.book_name == book_name)
+        if chapter is not None:
+            query = query.filter(models.BibleVerse.chapter == chapter)
+        if after_verse_id is not None:
+            query = query.filter(models.BibleVerse.verse_id > after_verse_id)
+        return query.order_by(models.BibleVerse.verse_id)
 
     def update_bible_verse(self, verse_id: int, verse_update: schemas.BibleVerseCreate):
         """Update an existing Bible verse."""
@@ -210,6 +952,7 @@ class Database:
         for key, value in verse_update.dict().items():
             setattr(db_verse, key, value)
         self.db.commit()
+        verse_store.invalidate()
         self.db.refresh(db_verse)
         return db_verse
 
@@ -220,6 +963,7 @@ class Database:
             return False
         self.db.delete(db_verse)
         self.db.commit()
+        verse_store.invalidate()
         return True
     
     # ---------------- Progress Methods ----------------
@@ -268,6 +1012,149 @@ class Database:
             self.db.refresh(progress)
         return db_progresses
 
+    def grade_answers(
+        self,
+        user_id: int,
+        section_id: int,
+        answers: Dict[int, int]
+    ) -> List[schemas.ProgressFeedback]:
+        """
+        Grade a submission and record a progress row for every answered question.
+
+        Answers are graded against the content snapshot and written back with one
+        multi-row insert inside one transaction, so the only round trip is the insert.
+
+        :param user_id: The ID of the user submitting the answers.
+        :param section_id: The ID of the section being answered.
+        :param answers: Mapping from question_id to the user's chosen option.
+        :return: A list of ProgressFeedback schemas in submission order. Unknown questions are skipped.
+        """
+        if not answers:
+            return []
+
+        questions = content_snapshot.get(self.db).questions_by_id
+
+        progress_rows = []
+        feedback_list = []
+        for question_id, user_answer in answers.items():
+            question = questions.get(question_id)
+            if question is None:
+                continue
+
+            is_correct = user_answer == question.correct_option
+            progress_rows.append({
+                "user_id": user_id,
+                "section_id": section_id,
+                "question_id": question_id,
+                "is_correct": is_correct,
+                "is_unsure": False
+            })
+            feedback_list.append(schemas.ProgressFeedback(
+                question_id=question_id,
+                question_text=question.question_text,
+                user_answer=user_answer,
+                correct_answer=question.correct_option,
+                result="Correct" if is_correct else "Incorrect",
+                explanation=question.hint
+            ))
+
+        if progress_rows:
+            try:
+                # executemany on a single INSERT is sent as one multi-row statement by the driver
+                self.db.execute(insert(models.Progress), progress_rows)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+        return feedback_list
+
+    def finish_attempt(
+        self,
+        user_id: int,
+        section_id: int,
+        answers: Dict[int, int],
+        time_taken: int = 0
+    ) -> Optional[schemas.AttemptResult]:
+        """
+        Grade a quiz attempt and record it in one transaction.
+
+        The attempt number comes from the user's attempt counter for the section, which
+        stays locked until the commit, so concurrent submissions get distinct numbers.
+        The counter, progress rows, score and leaderboard totals are committed together.
+
+        :param user_id: The ID of the user finishing the attempt.
+        :param section_id: The ID of the section attempted.
+        :param answers: Mapping from question_id to the user's chosen option.
+                        Answers to questions outside the section are ignored.
+        :param time_taken: Time spent on the attempt, in seconds.
+        :return: The graded attempt, or None if the section does not exist.
+        :raises ValueError: If no answer is to a question of the section; nothing is recorded.
+        """
+        snapshot = content_snapshot.get(self.db)
+        section = snapshot.sections_by_id.get(section_id)
+        if section is None:
+            return None
+
+        progress_rows = []
+        feedback_list = []
+        for question in snapshot.questions_by_section.get(section_id, ()):
+            user_answer = answers.get(question.question_id)
+            if user_answer is None:
+                continue
+            options = [question.option1, question.option2, question.option3, question.option4]
+            is_correct = user_answer == question.correct_option
+            progress_rows.append({
+                "user_id": user_id,
+                "section_id": section_id,
+                "question_id": question.question_id,
+                "is_correct": is_correct,
+                "is_unsure": False
+            })
+            feedback_list.append(schemas.AttemptFeedback(
+                question_id=question.question_id,
+                question_text=question.question_text,
+                user_answer=user_answer,
+                correct_answer=question.correct_option,
+                result="Correct" if is_correct else "Incorrect",
+                explanation=question.hint,
+                difficulty=question.difficulty,
+                bible_reference=question.bible_reference,
+                options=options,
+                user_answer_text=options[user_answer - 1] if 1 <= user_answer <= len(options) else "Invalid option",
+                correct_answer_text=options[question.correct_option - 1]
+            ))
+        if not feedback_list:
+            raise ValueError("No answers to questions of this section")
+        score = sum(1 for feedback in feedback_list if feedback.result == "Correct")
+
+        try:
+            db_score = models.Score(
+                user_id=user_id,
+                section_id=section_id,
+                attempt_number=self._next_attempt_number(user_id=user_id, section_id=section_id),
+                score=score,
+                time_taken=time_taken
+            )
+            self.db.add(db_score)
+            if progress_rows:
+                self.db.execute(insert(models.Progress), progress_rows)
+            self._add_to_leaderboard_totals(user_id=user_id, section_id=section_id, points=score)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return schemas.AttemptResult(
+            section_id=section_id,
+            section_name=section.name,
+            score_id=db_score.score_id,
+            attempt_number=db_score.attempt_number,
+            score=score,
+            total_questions=section.total_questions,
+            feedback=feedback_list
+        )
+
     def get_user_progress(self, user_id: int) -> List[models.Progress]:
         """
         Retrieve all progress records for a specific user.
@@ -280,6 +1167,36 @@ class Database:
     
     # ---------------- Leaderboard Methods ----------------
 
+    def _increment(self, model, keys: dict, column: str, amount: int):
+        """
+        Add `amount` to `column` of the row identified by `keys`, inserting the row if it
+        does not exist yet. Runs as one atomic upsert and does not commit.
+        """
+        table = model.__table__
+        values = {**keys, column: amount}
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'mysql':
+            stmt = mysql.insert(table).values(**values)
+            stmt = stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column]})
+        else:
+            dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = dialect_insert(table).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={column: table.c[column] + stmt.excluded[column]}
+            )
+        self.db.execute(stmt)
+
+    def _add_to_leaderboard_totals(self, user_id: int, section_id: int, points: int):
+        """Add a new score to the global and per-section totals. Does not commit."""
+        self._increment(models.UserTotal, {"user_id": user_id}, "total_score", points)
+        self._increment(
+            models.SectionUserTotal,
+            {"section_id": section_id, "user_id": user_id},
+            "total_score",
+            points
+        )
+
     def get_global_leaderboard(self, top_n: int = 10) -> List[schemas.UserScore]:
         """
         Retrieve the top N users based on total scores across all sections.
@@ -287,16 +1204,14 @@ class Database:
         :param top_n: Number of top users to retrieve.
         :return: List of UserScore schemas.
         """
-        # Sum the scores per user
+        # Read the maintained totals through the total_score index
         results = self.db.query(
             models.User.username,
-            func.sum(models.Score.score).label('total_score')
+            models.UserTotal.total_score
         ).join(
-            models.Score, models.User.user_id == models.Score.user_id
-        ).group_by(
-            models.User.user_id
+            models.UserTotal, models.User.user_id == models.UserTotal.user_id
         ).order_by(
-            func.sum(models.Score.score).desc()
+            models.UserTotal.total_score.desc()
         ).limit(top_n).all()
 
         # Convert the results into UserScore schemas
@@ -316,15 +1231,13 @@ class Database:
         """
         results = self.db.query(
             models.User.username,
-            func.sum(models.Score.score).label('total_score')
+            models.SectionUserTotal.total_score
         ).join(
-            models.Score, models.User.user_id == models.Score.user_id
+            models.SectionUserTotal, models.User.user_id == models.SectionUserTotal.user_id
         ).filter(
-            models.Score.section_id == section_id
-        ).group_by(
-            models.User.user_id
+            models.SectionUserTotal.section_id == section_id
         ).order_by(
-            func.sum(models.Score.score).desc()
+            models.SectionUserTotal.total_score.desc()
         ).limit(top_n).all()
 
         # Convert the results into UserScore schemas
@@ -333,6 +1246,137 @@ class Database:
             for username, total_score in results
         ]
         return leaderboard
+
+    def get_all_section_leaderboards(self, top_n: int = 10) -> List[schemas.SectionLeaderboard]:
+        """
+        Retrieve the top N users of every section in a single query.
+
+        Users are ranked per section with ROW_NUMBER() OVER (PARTITION BY section_id ...)
+        on the maintained section totals. Sections without scores get an empty leaderboard.
+
+        :param top_n: Number of top users to retrieve per section.
+        :return: List of SectionLeaderboard schemas, one per section.
+        """
+        ranked = select(
+            models.SectionUserTotal.section_id,
+            models.SectionUserTotal.user_id,
+            models.SectionUserTotal.total_score,
+            func.row_number().over(
+                partition_by=models.SectionUserTotal.section_id,
+                order_by=models.SectionUserTotal.total_score.desc()
+            ).label('position')
+        ).subquery()
+
+        results = self.db.query(
+            ranked.c.section_id,
+            models.User.username,
+            ranked.c.total_score
+        ).join(
+            models.User, models.User.user_id == ranked.c.user_id
+        ).filter(
+            ranked.c.position <= top_n
+        ).order_by(
+            ranked.c.section_id, ranked.c.position
+        ).all()
+
+        leaderboards = {
+            section.section_id: schemas.SectionLeaderboard(
+                section_id=section.section_id,
+                section_name=section.name,
+                leaderboard=[]
+            )
+            for section in self.get_sections()
+        }
+        for section_id, username, total_score in results:
+            if section_id in leaderboards:
+                leaderboards[section_id].leaderboard.append(
+                    schemas.UserScore(username=username, total_score=total_score)
+                )
+        return list(leaderboards.values())
+
+    def rebuild_leaderboard_totals(self, batch_size: int = 1000) -> int:
+        """
+        Repopulate user_totals, section_user_totals and the section_user_attempts
+        counters from the scores table.
+
+        Users are processed in batches of `batch_size` with one commit per batch, so the
+        rebuild never holds a transaction over the whole table. Run it while score writes
+        are paused; scores recorded mid-rebuild may otherwise be counted twice.
+
+        :param batch_size: Number of users aggregated per batch.
+        :return: The number of users whose totals were rebuilt.
+        """
+        self.db.query(models.SectionUserAttempt).delete(synchronize_session=False)
+        self.db.query(models.SectionUserTotal).delete(synchronize_session=False)
+        self.db.query(models.UserTotal).delete(synchronize_session=False)
+        self.db.commit()
+
+        rebuilt = 0
+        last_user_id = 0
+        while True:
+            user_ids = [
+                user_id for (user_id,) in self.db.query(models.Score.user_id).filter(
+                    models.Score.user_id > last_user_id
+                ).distinct().order_by(models.Score.user_id).limit(batch_size)
+            ]
+            if not user_ids:
+                break
+
+            in_batch = models.Score.user_id.between(user_ids[0], user_ids[-1])
+            self.db.execute(
+                insert(models.UserTotal.__table__).from_select(
+                    ['user_id', 'total_score'],
+                    select(models.Score.user_id, func.sum(models.Score.score)).where(
+                        in_batch
+                    ).group_by(models.Score.user_id)
+                )
+            )
+            self.db.execute(
+                insert(models.SectionUserTotal.__table__).from_select(
+                    ['section_id', 'user_id', 'total_score'],
+                    select(models.Score.section_id, models.Score.user_id, func.sum(models.Score.score)).where(
+                        in_batch
+                    ).group_by(models.Score.section_id, models.Score.user_id)
+                )
+            )
+            # Numbering continues after the highest attempt already recorded
+            self.db.execute(
+                insert(models.SectionUserAttempt.__table__).from_select(
+                    ['section_id', 'user_id', 'attempts'],
+                    select(models.Score.section_id, models.Score.user_id, func.max(models.Score.attempt_number)).where(
+                        in_batch
+                    ).group_by(models.Score.section_id, models.Score.user_id)
+                )
+            )
+            self.db.commit()
+
+            rebuilt += len(user_ids)
+            last_user_id = user_ids[-1]
+
+        return rebuilt
+
+    def backfill_leaderboard_totals(self) -> int:
+        """
+        Rebuild the aggregate tables when scores exist but an aggregate table is empty,
+        as on a database created before the tables were added.
+
+        Attempt numbering and the leaderboards read only the aggregates, so without this
+        they would restart from nothing until rebuild_leaderboard_totals was run by hand.
+
+        :return: The number of users whose totals were rebuilt, 0 when nothing was missing.
+        """
+        if self.db.query(models.Score.score_id).first() is None:
+            return 0
+        aggregates = (models.UserTotal, models.SectionUserTotal, models.SectionUserAttempt)
+        if all(self.db.query(aggregate).first() is not None for aggregate in aggregates):
+            return 0
+        try:
+            return self.rebuild_leaderboard_totals()
+        except IntegrityError:
+            # Another worker started at the same time and rebuilt them first
+            self.db.rollback()
+            logger.info("Leaderboard totals were rebuilt by another process")
+            return 0
     
 
     # ---------------- Context Manager Support ----------------
@@ -342,3 +1386,104 @@ class Database:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+class AsyncDatabase:
+    """
+    Awaitable counterpart of Database, backed by the asyncio engine.
+
+    Each method runs the Database method of the same name against this session's
+    connection through AsyncSession.run_sync, so no thread pool slot is held while
+    waiting on the database and the query logic lives in one place. Only the methods
+    the async routes use are exposed; add a wrapper here when a route needs another.
+    """
+
+    def __init__(self):
+        self.session: AsyncSession = AsyncSessionLocal()
+
+    async def close(self):
+        await self.session.close()
+
+    async def _run(self, method: Callable[..., T], *args, **kwargs) -> T:
+        """Await the unbound Database `method` on this session."""
+        def call(sync_session: Session):
+            return method(Database(session=sync_session), *args, **kwargs)
+        return await self.session.run_sync(call)
+
+    # ---------------- User Methods ----------------
+
+    async def get_user_by_username(self, username: str) -> Optional[models.User]:
+        return await self._run(Database.get_user_by_username, username=username)
+
+    async def get_user_token_state(self, user_id: int) -> Optional[schemas.UserTokenState]:
+        return await self._run(Database.get_user_token_state, user_id=user_id)
+
+    # ---------------- Score Methods ----------------
+
+    async def create_score(self, score: schemas.ScoreCreate, user_id: int) -> models.Score:
+        return await self._run(Database.create_score, score=score, user_id=user_id)
+
+    async def get_user_scores(self, user_id: int) -> List[models.Score]:
+        return await self._run(Database.get_user_scores, user_id=user_id)
+
+    async def get_section_scores(self, section_id: int) -> List[models.Score]:
+        return await self._run(Database.get_section_scores, section_id=section_id)
+
+    async def stream_section_scores(self, section_id: int, batch_size: int = 1000) -> AsyncIterator[models.Score]:
+        """
+        Yield every score of a section, reading `batch_size` rows at a time from a
+        server-side cursor instead of loading the whole result.
+        """
+        statement = select(models.Score).where(
+            models.Score.section_id == section_id
+        ).order_by(models.Score.score_id).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(statement)
+        async for score in result:
+            yield score
+
+    async def get_dashboard(self, user_id: int) -> schemas.Dashboard:
+        return await self._run(Database.get_dashboard, user_id=user_id)
+
+    async def get_user_section_attempts_count(self, user_id: int, section_id: int) -> int:
+        return await self._run(Database.get_user_section_attempts_count, user_id=user_id, section_id=section_id)
+
+    # ---------------- Progress Methods ----------------
+
+    async def create_progress_entries(self, progress_list: List[schemas.ProgressCreate]) -> List[models.Progress]:
+        return await self._run(Database.create_progress_entries, progress_list=progress_list)
+
+    async def grade_answers(self, user_id: int, section_id: int, answers: Dict[int, int]) -> List[schemas.ProgressFeedback]:
+        return await self._run(Database.grade_answers, user_id=user_id, section_id=section_id, answers=answers)
+
+    async def finish_attempt(
+        self,
+        user_id: int,
+        section_id: int,
+        answers: Dict[int, int],
+        time_taken: int = 0
+    ) -> Optional[schemas.AttemptResult]:
+        return await self._run(
+            Database.finish_attempt, user_id=user_id, section_id=section_id, answers=answers, time_taken=time_taken
+        )
+
+    async def get_user_progress(self, user_id: int) -> List[models.Progress]:
+        return await self._run(Database.get_user_progress, user_id=user_id)
+
+    # ---------------- Leaderboard Methods ----------------
+
+    async def get_global_leaderboard(self, top_n: int = 10) -> List[schemas.UserScore]:
+        return await self._run(Database.get_global_leaderboard, top_n=top_n)
+
+    async def get_section_leaderboard(self, section_id: int, top_n: int = 10) -> List[schemas.UserScore]:
+        return await self._run(Database.get_section_leaderboard, section_id=section_id, top_n=top_n)
+
+    async def get_all_section_leaderboards(self, top_n: int = 10) -> List[schemas.SectionLeaderboard]:
+        return await self._run(Database.get_all_section_leaderboards, top_n=top_n)
+
+    # ---------------- Context Manager Support ----------------
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
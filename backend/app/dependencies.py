@@ -1,5 +1,5 @@
 from fastapi import Depends
-from .database import Database
+from .database import Database, AsyncDatabase
 from fastapi import Depends, HTTPException, status
 
 from . import auth, schemas
@@ -9,6 +9,10 @@ def get_db():
     with Database() as db:
         yield db
 
+async def get_async_db():
+    async with AsyncDatabase() as db:
+        yield db
+
 def require_role(required_role: str):
     def role_checker(current_user: schemas.User = Depends(auth.get_current_user)):
         if current_user.role != required_role:
@@ -0,0 +1,47 @@
+# app/http_cache.py
+"""
+Conditional GET support: ETags and If-None-Match handling.
+
+Routes derive the ETag from a content digest they already hold, so a 304 is answered
+without building the response body. The compression middleware may encode the same
+body as gzip, br or identity, so the ETags are weak: they promise the same content,
+not the same bytes. Vary: Accept-Encoding keeps shared caches from serving one
+encoding to a client that asked for another.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Shared caches may store these but must revalidate every time
+PUBLIC_REVALIDATE = "public, no-cache"
+# Responses that depend on the caller, only the client's own cache may keep them
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """A weak ETag over the given parts, e.g. a content digest and the query string."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag.removeprefix("W/") for candidate in candidates)
+
+
+def conditional(request: Request, response: Response, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    Tag `response` with the ETag and Cache-Control headers.
+
+    :return: A 304 response to send instead when the client's copy is current, else None.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,16 +1,72 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware  # Import CORS middleware
-from .routers import users, sections, questions, scores, bible, leaderboards, progress
-from .database import engine
-from .models import Base
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from .routers import users, sections, questions, scores, bible, leaderboards, progress, health, dashboard
+from .database import engine, async_engine, Database, SessionLocal
 from .logging_config import setup_logging
+from .schema_upgrade import upgrade_schema
+from .verse_store import verse_store, VERSE_STORE_ENABLED
 
 setup_logging()
+logger = logging.getLogger(__name__)
+
+# Create missing tables and bring existing ones up to the current models, before
+# the startup backfills below read the new columns
+upgrade_schema(engine)
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1000'))  # Bytes
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # brotli-asgi is optional, gzip is always available
+    BrotliMiddleware = None
+
+
+def backfill_question_hashes():
+    # Questions stored without a current content hash need one for incremental imports
+    with Database() as db:
+        db.backfill_question_hashes()
+
+
+def backfill_leaderboard_totals():
+    # Databases that predate the aggregate tables have scores but no totals or attempt counters
+    with Database() as db:
+        rebuilt = db.backfill_leaderboard_totals()
+    if rebuilt:
+        logger.info(f"Rebuilt leaderboard totals and attempt counters for {rebuilt} users")
 
-# Creating the Database Table
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+def load_content_snapshot():
+    # Section and question reads are served from memory, build the first snapshot now
+    with Database() as db:
+        db.get_sections()
+
+
+def load_verse_store():
+    # The Bible corpus is read-only after load, serve lookups from memory
+    if VERSE_STORE_ENABLED:
+        verse_store.load(SessionLocal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup work runs in order before the first request is accepted
+    backfill_question_hashes()
+    backfill_leaderboard_totals()
+    load_content_snapshot()
+    load_verse_store()
+    yield
+    await async_engine.dispose()
+
+
+# orjson serialises the already-encoded response data several times faster than json
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -19,12 +75,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor"],  # Paging cursor of GET /bible/
 )
 
+# Compress JSON bodies, with brotli when the client accepts it and the package is installed
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
 app.include_router(users.router)
 app.include_router(sections.router)
 app.include_router(questions.router)
 app.include_router(scores.router)
 app.include_router(bible.router)
 app.include_router(leaderboards.router)
-app.include_router(progress.router)
\ No newline at end of file
+app.include_router(progress.router)
+app.include_router(health.router)
+app.include_router(dashboard.router)
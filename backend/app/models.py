@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Enum as SqlEnum, Table, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Enum as SqlEnum, Table, DateTime, JSON, Index, UniqueConstraint, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import JSON
 from sqlalchemy.ext.declarative import declarative_base
@@ -18,6 +18,8 @@ class User(Base):
     username = Column(String(50), unique=True, index=True, nullable=False)
     password_hash = Column(String(128), nullable=False)
     role = Column(SqlEnum(Role), default=Role.user)
+    # Bumped to reject every token issued so far, tokens carry the version they were issued at
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     scores = relationship("Score", back_populates="user")
@@ -67,6 +69,10 @@ class Question(Base):
     bible_reference_end_chapter = Column(Integer, nullable=True)
     bible_reference_start_verse = Column(Integer, nullable=True)
     bible_reference_end_verse = Column(Integer, nullable=True)
+    # SHA-256 over the question content, see content_hash.question_content_hash
+    content_hash = Column(String(64), nullable=True, index=True)
+    # Retired questions are kept for progress history but no longer served
+    is_retired = Column(Boolean, nullable=False, default=False, server_default=false())
     # Relationships
     section = relationship("Section", back_populates="questions")
     progresses = relationship("Progress", back_populates="question")
@@ -88,6 +94,47 @@ class Score(Base):
     user = relationship("User", back_populates="scores")
     section = relationship("Section", back_populates="scores")
 
+    __table_args__ = (
+        Index('ix_scores_user_section_attempt', 'user_id', 'section_id', 'attempt_number'),
+    )
+
+
+# ---------------- Leaderboard Aggregates ----------------
+# Running score totals kept up to date by Database.create_score, so leaderboards
+# read the top N through an index instead of summing the whole scores table.
+
+class UserTotal(Base):
+    __tablename__ = 'user_totals'
+
+    user_id = Column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    total_score = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_user_totals_total_score', 'total_score'),
+    )
+
+
+class SectionUserTotal(Base):
+    __tablename__ = 'section_user_totals'
+
+    section_id = Column(Integer, ForeignKey('sections.section_id'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    total_score = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_section_user_totals_section_total', 'section_id', 'total_score'),
+    )
+
+
+# Attempts per user and section, i.e. the last attempt_number handed out. Bumped in
+# the same transaction as the score insert, so numbering needs no MAX() over scores.
+class SectionUserAttempt(Base):
+    __tablename__ = 'section_user_attempts'
+
+    section_id = Column(Integer, ForeignKey('sections.section_id'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
 
 class Progress(Base):
     __tablename__ = 'progresses'
@@ -115,6 +162,13 @@ class BibleVerse(Base):
     text = Column(Text, nullable=False)
     version = Column(String(50), nullable=False)
 
+    __table_args__ = (
+        UniqueConstraint('book_name', 'chapter', 'verse', 'version', name='uq_bible_verses_book_chapter_verse_version'),
+        # Keyset pages in verse_id order, filtered by translation and optionally book and chapter
+        Index('ix_bible_verses_version_verse_id', 'version', 'verse_id'),
+        Index('ix_bible_verses_version_book_chapter_verse_id', 'version', 'book_name', 'chapter', 'verse_id'),
+    )
+
 
 class SectionCompletion(Base):
     __tablename__ = 'section_completions'
@@ -0,0 +1,38 @@
+# app/rebuild_leaderboards.py
+"""
+Rebuild the leaderboard aggregate tables and the per-section attempt counters from
+the scores table.
+
+The backend runs the same rebuild at startup when scores exist but an aggregate table
+is empty. Run it by hand whenever the totals are suspected to have drifted:
+
+    python -m app.rebuild_leaderboards --batch-size 1000
+"""
+import argparse
+import logging
+import time
+
+from .database import Database, engine
+from .logging_config import setup_logging
+from .schema_upgrade import upgrade_schema
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild leaderboard totals and attempt counters from the scores table.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Number of users aggregated per batch.")
+    args = parser.parse_args()
+
+    setup_logging()
+    # Make sure the aggregate tables exist on databases created before they were added
+    upgrade_schema(engine)
+
+    start = time.perf_counter()
+    with Database() as db:
+        rebuilt = db.rebuild_leaderboard_totals(batch_size=args.batch_size)
+    logger.info(f"Rebuilt leaderboard totals and attempt counters for {rebuilt} users in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
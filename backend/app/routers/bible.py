@@ -1,14 +1,22 @@
 # routers/bible.py
 import logging
-from typing import List
+from typing import List, Optional
+import base64
 import json
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from .. import schemas, auth, database, dependencies
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from .. import schemas, auth, database, dependencies, http_cache, streaming
+from ..bible_reference import make_passage_range
+from ..verse_search import parse_query
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Largest page GET /bible/ returns, larger limits are cut to this
+BIBLE_PAGE_MAX_LIMIT = 1000
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 router = APIRouter(
     prefix="/bible",
     tags=["bible"],
@@ -16,34 +24,182 @@ router = APIRouter(
 )
 
 
+def _not_modified(request: Request, response: Response, db: database.Database) -> Optional[Response]:
+    """ETag verse responses by the verse store's content and the request URL."""
+    digest = db.get_verse_store_digest()
+    if digest is None:
+        return None
+    etag = http_cache.make_etag(digest, request.url.path, request.url.query)
+    return http_cache.conditional(request, response, etag, http_cache.PRIVATE_REVALIDATE)
+
+def _encode_cursor(verse_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"after": verse_id}).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+        if not isinstance(after, int):
+            raise ValueError(after)
+        return after
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+def _stream_verses(**filters):
+    # The stream outlives the request's session, so it reads through its own
+    with database.Database() as db:
+        yield from db.iter_bible_verses(batch_size=streaming.STREAM_BATCH_SIZE, **filters)
+
+
 @router.get(
     "/", 
     response_model=List[schemas.BibleVerse]
 )
 def read_verses(
-    skip: int = 0,
-    limit: int = 100,
-    db: database.Database = Depends(dependencies.get_db),
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=0),
+    version: Optional[str] = None,
+    book: Optional[str] = None,
+    chapter: Optional[int] = None,
+    stream: bool = False,
     current_user: schemas.User = Depends(auth.get_current_user)
 ):
     """
-    Retrieve a list of Bible verses.
+    Retrieve a page of Bible verses, optionally filtered by version, book and chapter.
+
+    When more verses follow, the X-Next-Cursor header holds a cursor; pass it back as
+    `cursor` to fetch the following page as an index range read. `skip` still pages by
+    offset for older clients. `limit` is capped at BIBLE_PAGE_MAX_LIMIT. With
+    `stream=true` every verse after `cursor` is written as NDJSON, one per line, and
+    `limit` is ignored. A stream reads through a session of its own, so the route opens
+    its session itself rather than through get_db.
     """
-    logger.info(f"User '{current_user.username}' is fetching Bible verses with skip={skip}, limit={limit}")
+    logger.info(
+        f"User '{current_user.username}' is fetching Bible verses with skip={skip}, cursor={cursor}, limit={limit}, "
+        f"version={version}, book={book}, chapter={chapter}, stream={stream}"
+    )
+    after_verse_id = _decode_cursor(cursor) if cursor else None
+    if stream:
+        verses = _stream_verses(after_verse_id=after_verse_id, version=version, book_name=book, chapter=chapter)
+        return streaming.ndjson_response(streaming.iter_ndjson(verses, schemas.BibleVerse))
+    limit = min(limit, BIBLE_PAGE_MAX_LIMIT)
     try:
-        verses = db.get_bible_verses(skip=skip, limit=limit)
-        logger.info(f"Retrieved {len(verses)} Bible verses")
-        return verses
+        # One extra row tells whether another page exists
+        with database.Database() as db:
+            verses = db.get_bible_verses(
+                after_verse_id=after_verse_id,
+                limit=limit + 1,
+                skip=skip,
+                version=version,
+                book_name=book,
+                chapter=chapter
+            )
     except Exception as e:
         logger.error(f"Error fetching Bible verses: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching Bible verses.")
 
+    next_cursor = {}
+    if len(verses) > limit:
+        verses = verses[:limit]
+        if verses:
+            next_cursor[NEXT_CURSOR_HEADER] = _encode_cursor(verses[-1].verse_id)
+    logger.info(f"Retrieved {len(verses)} Bible verses")
+
+    # The page is read from the database, not the verse store, so tag it by its own rows
+    etag = http_cache.make_etag(
+        request.url.path,
+        request.url.query,
+        *((verse.verse_id, verse.version, verse.book_name, verse.chapter, verse.verse, verse.text) for verse in verses)
+    )
+    not_modified = http_cache.conditional(request, response, etag, http_cache.PRIVATE_REVALIDATE)
+    if not_modified:
+        not_modified.headers.update(next_cursor)
+        return not_modified
+    response.headers.update(next_cursor)
+    return verses
+
+@router.get(
+    "/search",
+    response_model=schemas.BibleSearchResult
+)
+def search_verses(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    version: Optional[str] = None,
+    book: Optional[str] = None,
+    offset: int = Query(0, ge=0, le=10000),
+    limit: int = Query(20, ge=1, le=100),
+    db: database.Database = Depends(dependencies.get_db),
+    current_user: schemas.User = Depends(auth.get_current_user)
+):
+    """
+    Search verse text. Every word and "quoted phrase" in `q` must match.
+    """
+    logger.info(f"User '{current_user.username}' is searching verses for '{q}' (version={version}, book={book})")
+    not_modified = _not_modified(request, response, db)
+    if not_modified:
+        return not_modified
+    if not parse_query(q):
+        raise HTTPException(status_code=400, detail="Search query has no words.")
+    try:
+        result = db.search_bible_verses(query=q, version=version, book_name=book, offset=offset, limit=limit)
+        logger.info(f"Found {result.total} verses matching '{q}'")
+        return result
+    except Exception as e:
+        logger.error(f"Error searching verses: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while searching Bible verses.")
+
+@router.get(
+    "/passage",
+    response_model=schemas.BiblePassage
+)
+def read_passage(
+    request: Request,
+    response: Response,
+    book: str,
+    start_chapter: int = Query(..., ge=1),
+    start_verse: Optional[int] = Query(None, ge=1),
+    end_chapter: Optional[int] = Query(None, ge=1),
+    end_verse: Optional[int] = Query(None, ge=1),
+    version: str = "KJV",
+    db: database.Database = Depends(dependencies.get_db),
+    current_user: schemas.User = Depends(auth.get_current_user)
+):
+    """
+    Retrieve every verse from start_chapter:start_verse to end_chapter:end_verse of a book.
+
+    Without start_verse whole chapters are returned. With start_verse alone, that single verse.
+    """
+    logger.info(
+        f"User '{current_user.username}' is fetching passage {book} "
+        f"{start_chapter}:{start_verse}-{end_chapter}:{end_verse} ({version})"
+    )
+    not_modified = _not_modified(request, response, db)
+    if not_modified:
+        return not_modified
+    try:
+        passage = make_passage_range(book, start_chapter, start_verse, end_chapter, end_verse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        verses = db.get_bible_passage(passage=passage, version=version)
+        logger.info(f"Retrieved {len(verses)} verses for the passage")
+        return schemas.BiblePassage(**passage._asdict(), version=version, verses=verses)
+    except Exception as e:
+        logger.error(f"Error fetching passage: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while fetching the passage.")
+
 @router.get(
     "/{verse_id}", 
     response_model=schemas.BibleVerse
 )
 def read_verse(
     verse_id: int,
+    request: Request,
+    response: Response,
     db: database.Database = Depends(dependencies.get_db),
     current_user: schemas.User = Depends(auth.get_current_user)
 ):
@@ -51,8 +207,11 @@ def read_verse(
     Retrieve a specific Bible verse by ID.
     """
     logger.info(f"User '{current_user.username}' is fetching Bible verse with ID: {verse_id}")
+    not_modified = _not_modified(request, response, db)
+    if not_modified:
+        return not_modified
     try:
-        verse = db.get_bible_verse_by_id(verse_id=verse_id)
+        verse = db.lookup_bible_verse(verse_id=verse_id)
         if not verse:
             logger.warning(f"Bible verse with ID {verse_id} not found")
             raise HTTPException(status_code=404, detail="Bible verse not found.")
@@ -172,7 +331,7 @@ def delete_verse(
 
 @router.post(
     "/batch", 
-    response_model=List[schemas.BibleVerse], 
+    response_model=schemas.BibleVerseBatchResult, 
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(dependencies.require_role("admin"))]
 )
@@ -182,65 +341,50 @@ def create_verses_in_batch(
     current_user: schemas.User = Depends(auth.get_current_user)
 ):
     """
-    Create multiple Bible verses in batch.
+    Create multiple Bible verses in batch, skipping verses that already exist.
     """
-    created_verses = []
     logger.info(f"User '{current_user.username}' is creating {len(verses)} Bible verses in batch.")
     try:
-        for verse in verses:
-            # Check if the verse already exists
-            existing_verse = db.get_bible_verse_by_details(
-                book_name=verse.book_name, 
-                chapter=verse.chapter, 
-                verse=verse.verse, 
-                version=verse.version
-            )
-            if existing_verse:
-                continue  # Skip this verse if it already exists
-
-            new_verse = db.create_bible_verse(verse=verse)
-            created_verses.append(new_verse)
-            
-        logger.info(f"Successfully created {len(created_verses)} Bible verses.")
-        return created_verses
+        created = db.bulk_create_bible_verses(verses=verses)
+        logger.info(f"Successfully created {created} Bible verses, skipped {len(verses) - created}.")
+        return schemas.BibleVerseBatchResult(
+            received=len(verses),
+            created=created,
+            skipped=len(verses) - created
+        )
     except Exception as e:
         logger.error(f"Error creating Bible verses in batch: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while creating the Bible verses.")
 
 # Load JSON from file and create verses
-def load_verses_from_json(file_path: str, db: database.Database):
+def load_verses_from_json(file_path: str, db: database.Database, chunk_size: int = database.BIBLE_BATCH_CHUNK_SIZE):
     """
-    Load Bible verses from a JSON file and insert them into the database.
+    Load Bible verses from a JSON lines file and insert them into the database.
     """
-    created_verses = []
+    created = 0
+    chunk = []
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             for line in file:
+                if not line.strip():
+                    continue
                 verse_data = json.loads(line.strip())  # Parse each line as JSON
-                verse = schemas.BibleVerseCreate(
+                chunk.append(schemas.BibleVerseCreate(
                     book_name=verse_data["book_name"],
-                    book_id=verse_data["book_id"],
                     chapter=verse_data["chapter"],
                     verse=verse_data["verse"],
                     text=verse_data["text"],
                     version=verse_data["translation_id"]
-                )
-                # Create each verse using the db.create_bible_verse method
-                existing_verse = db.get_bible_verse_by_details(
-                    book_name=verse.book_name, 
-                    chapter=verse.chapter, 
-                    verse=verse.verse, 
-                    version=verse.version
-                )
-                if not existing_verse:
-                    new_verse = db.create_bible_verse(verse=verse)
-                    created_verses.append(new_verse)
-                else:
-                    logger.info(f"Verse already exists: {verse.book_name} {verse.chapter}:{verse.verse} ({verse.version})")
-
-        logger.info(f"Successfully created {len(created_verses)} verses from JSON.")
-        return created_verses
+                ))
+                if len(chunk) >= chunk_size:
+                    created += db.bulk_create_bible_verses(verses=chunk, chunk_size=chunk_size)
+                    chunk = []
+            if chunk:
+                created += db.bulk_create_bible_verses(verses=chunk, chunk_size=chunk_size)
+
+        logger.info(f"Successfully created {created} verses from JSON.")
+        return created
 
     except Exception as e:
         logger.error(f"Error loading verses from JSON file {file_path}: {e}")
-        raise e
\ No newline at end of file
+        raise e
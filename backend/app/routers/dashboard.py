@@ -0,0 +1,33 @@
+# app/routers/dashboard.py
+from fastapi import APIRouter, HTTPException, Depends
+from .. import schemas, database, auth, dependencies
+import logging
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"],
+)
+
+logger = logging.getLogger(__name__)
+
+@router.get("/", response_model=schemas.Dashboard)
+async def read_dashboard(
+    current_user: schemas.User = Depends(auth.get_current_user),
+    db: database.AsyncDatabase = Depends(dependencies.get_async_db)
+):
+    """
+    Everything the dashboard page shows for the current user: every section with its
+    question count, latest and best score and number of attempts, and completion counts.
+    """
+    logger.info(f"Fetching dashboard for user {current_user.user_id}")
+
+    try:
+        dashboard = await db.get_dashboard(user_id=current_user.user_id)
+        logger.info(
+            f"User {current_user.user_id} has completed {dashboard.completed_sections} "
+            f"of {dashboard.total_sections} sections"
+        )
+        return dashboard
+    except Exception as e:
+        logger.error(f"Error fetching dashboard for user {current_user.user_id}: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while fetching the dashboard")
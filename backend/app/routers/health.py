@@ -0,0 +1,81 @@
+# app/routers/health.py
+from fastapi import APIRouter, Depends
+from typing import List
+from .. import database, dependencies
+from ..content_snapshot import content_snapshot
+from ..verse_store import verse_store
+import logging
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+logger = logging.getLogger(__name__)
+
+@router.get(
+    "/db-pool",
+    response_model=List[dict],
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+async def get_db_pool_statistics():
+    """
+    Report checkout and wait statistics for the sync and async connection pools.
+    """
+    logger.info("Fetching database pool statistics")
+    return database.pool_statistics()
+
+
+@router.get(
+    "/content-snapshot",
+    response_model=dict,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+async def get_content_snapshot():
+    """
+    Report the version and size of the in-process sections and questions snapshot.
+    """
+    return content_snapshot.stats()
+
+
+@router.post(
+    "/content-snapshot/refresh",
+    response_model=dict,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+def refresh_content_snapshot(
+    db: database.Database = Depends(dependencies.get_db)
+):
+    """
+    Rebuild the snapshot, for content written to the database outside the API.
+    """
+    logger.info("Refreshing the content snapshot")
+    content_snapshot.refresh(db.db)
+    return content_snapshot.stats()
+
+
+@router.get(
+    "/verse-store",
+    response_model=dict,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+async def get_verse_store():
+    """
+    Report whether the in-process verse store is loaded, and its size and digest.
+    """
+    return verse_store.stats()
+
+
+@router.post(
+    "/verse-store/refresh",
+    response_model=dict,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+async def refresh_verse_store():
+    """
+    Drop the verse store and rebuild it in the background, for verses written to the
+    database outside the API. Lookups use the database until the rebuild finishes.
+    """
+    logger.info("Refreshing the verse store")
+    verse_store.invalidate()
+    return verse_store.stats()
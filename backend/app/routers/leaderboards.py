@@ -12,10 +12,10 @@ router = APIRouter(
 logger = logging.getLogger(__name__)
 
 @router.get("/global", response_model=List[schemas.UserScore])
-def get_global_leaderboard(db: database.Database = Depends(dependencies.get_db)):
+async def get_global_leaderboard(db: database.AsyncDatabase = Depends(dependencies.get_async_db)):
     logger.info("Fetching global leaderboard")
     
-    leaderboard = db.get_global_leaderboard()
+    leaderboard = await db.get_global_leaderboard()
     if not leaderboard:
         logger.warning("No leaderboard data found")
         raise HTTPException(status_code=404, detail="No leaderboard data found")
@@ -23,12 +23,23 @@ def get_global_leaderboard(db: database.Database = Depends(dependencies.get_db))
     return leaderboard
 
 @router.get("/section/{section_id}", response_model=List[schemas.UserScore])
-def get_section_leaderboard(section_id: int, db: database.Database = Depends(dependencies.get_db)):
+async def get_section_leaderboard(section_id: int, db: database.AsyncDatabase = Depends(dependencies.get_async_db)):
     logger.info(f"Fetching leaderboard for section_id={section_id}")
     
-    leaderboard = db.get_section_leaderboard(section_id=section_id)
+    leaderboard = await db.get_section_leaderboard(section_id=section_id)
     if not leaderboard:
         logger.warning(f"No leaderboard data found for section_id={section_id}")
         raise HTTPException(status_code=404, detail="No leaderboard data found for this section")
     
     return leaderboard
+
+@router.get("/sections", response_model=List[schemas.SectionLeaderboard])
+async def get_all_section_leaderboards(top_n: int = 10, db: database.AsyncDatabase = Depends(dependencies.get_async_db)):
+    logger.info(f"Fetching leaderboards for all sections with top_n={top_n}")
+    
+    leaderboards = await db.get_all_section_leaderboards(top_n=top_n)
+    if not leaderboards:
+        logger.warning("No sections found for leaderboards")
+        raise HTTPException(status_code=404, detail="No sections found")
+    
+    return leaderboards
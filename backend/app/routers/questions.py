@@ -1,6 +1,6 @@
 import logging
-from fastapi import APIRouter, HTTPException, Depends
-from .. import schemas, database, dependencies
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from .. import schemas, database, dependencies, http_cache, streaming
 from typing import List, Optional
 from fastapi import status
 
@@ -15,9 +15,17 @@ router = APIRouter(
 @router.get("/section/{section_id}", response_model=List[schemas.Question])
 def read_questions_by_section(
     section_id: int, 
+    request: Request,
+    response: Response,
     db: database.Database = Depends(dependencies.get_db)
 ):
     logger.info(f"Fetching questions for section_id={section_id}")
+    
+    etag = http_cache.make_etag(db.get_questions_digest(section_id=section_id), section_id)
+    not_modified = http_cache.conditional(request, response, etag, http_cache.PUBLIC_REVALIDATE)
+    if not_modified:
+        return not_modified
+    
     questions = db.get_questions_by_section(section_id=section_id)
     
     if not questions:
@@ -27,6 +35,36 @@ def read_questions_by_section(
     logger.info(f"Found {len(questions)} questions for section_id={section_id}")
     return questions
 
+@router.get("/section/{section_id}/passages", response_model=List[schemas.QuestionPassage])
+def read_question_passages(
+    section_id: int,
+    request: Request,
+    response: Response,
+    version: str = "KJV",
+    db: database.Database = Depends(dependencies.get_db)
+):
+    logger.info(f"Fetching passages for the questions of section_id={section_id} ({version})")
+    
+    verse_digest = db.get_verse_store_digest()
+    if verse_digest is not None:
+        etag = http_cache.make_etag(db.get_questions_digest(section_id=section_id), verse_digest, request.url.path, request.url.query)
+        not_modified = http_cache.conditional(request, response, etag, http_cache.PUBLIC_REVALIDATE)
+        if not_modified:
+            return not_modified
+    
+    try:
+        passages = db.get_question_passages(section_id=section_id, version=version)
+    except Exception as e:
+        logger.error(f"Error fetching passages for section_id={section_id}: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while fetching the passages")
+    
+    if not passages:
+        logger.warning(f"No questions found for section_id={section_id}")
+        raise HTTPException(status_code=404, detail="No questions found for this section")
+    
+    logger.info(f"Resolved passages for {len(passages)} questions in section_id={section_id}")
+    return passages
+
 @router.post("/", response_model=schemas.Question)
 def create_new_question(
     question: schemas.QuestionCreate, 
@@ -38,13 +76,34 @@ def create_new_question(
     logger.info(f"Created new question")
     return new_question
 
+@router.get(
+    "/hashes",
+    response_model=List[schemas.QuestionKey],
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+def read_question_hashes(
+    db: database.Database = Depends(dependencies.get_db)
+):
+    logger.info("Fetching content hashes of active questions")
+    
+    hashes = db.get_question_hashes()
+    logger.info(f"Found {len(hashes)} question hashes")
+    return hashes
+
 @router.get("/{question_id}", response_model=schemas.Question)
 def read_question(
     question_id: int, 
+    request: Request,
+    response: Response,
     db: database.Database = Depends(dependencies.get_db)
 ):
     logger.info(f"Fetching question with id={question_id}")
     
+    etag = http_cache.make_etag(db.get_questions_digest(), question_id)
+    not_modified = http_cache.conditional(request, response, etag, http_cache.PUBLIC_REVALIDATE)
+    if not_modified:
+        return not_modified
+    
     question = db.get_question(question_id=question_id)
     
     if question is None:
@@ -56,11 +115,29 @@ def read_question(
 
 @router.get("/", response_model=List[schemas.Question])
 def read_all_questions(
+    request: Request,
+    response: Response,
+    stream: bool = False,
     db: database.Database = Depends(dependencies.get_db)
 ):
-    logger.info("Fetching all questions")
+    """
+    Retrieve every active question.
+
+    With `stream=true` the questions are written as NDJSON, one per line, as they are
+    encoded instead of as one JSON array.
+    """
+    logger.info(f"Fetching all questions (stream={stream})")
+    
+    etag = http_cache.make_etag(db.get_questions_digest(), stream)
+    not_modified = http_cache.conditional(request, response, etag, http_cache.PUBLIC_REVALIDATE)
+    if not_modified:
+        return not_modified
     
     questions = db.get_all_questions()
+
+    if stream:
+        # The snapshot already holds the questions, only the body is built incrementally
+        return streaming.ndjson_response(streaming.iter_ndjson(questions), headers=dict(response.headers))
     
     if not questions:
         logger.warning("No questions found")
@@ -95,7 +172,7 @@ def read_questions_by_section(
 
 @router.post(
     "/bulk_create/",
-    response_model=List[schemas.Question],
+    response_model=schemas.QuestionBulkCreateResult,
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(dependencies.require_role("admin"))]
 )
@@ -103,8 +180,37 @@ def bulk_create_questions(
     questions: List[schemas.QuestionCreate],
     db: database.Database = Depends(dependencies.get_db)
 ):
-    created_questions = []
-    for question in questions:
-        new_question = db.create_question(question=question)
-        created_questions.append(new_question)
-    return created_questions
\ No newline at end of file
+    logger.info(f"Bulk creating {len(questions)} questions")
+    
+    try:
+        question_ids = db.bulk_create_questions(questions=questions)
+    except ValueError as e:
+        logger.warning(f"Rejected bulk question import: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error bulk creating questions: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while creating the questions")
+    
+    logger.info(f"Created {len(question_ids)} questions")
+    return schemas.QuestionBulkCreateResult(created=len(question_ids), question_ids=question_ids)
+
+
+@router.post(
+    "/retire",
+    response_model=schemas.QuestionRetireResult,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+def retire_questions(
+    keys: List[schemas.QuestionKey],
+    db: database.Database = Depends(dependencies.get_db)
+):
+    logger.info(f"Retiring {len(keys)} questions by section and content hash")
+    
+    try:
+        retired = db.retire_questions(keys=keys)
+    except Exception as e:
+        logger.error(f"Error retiring questions: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while retiring the questions")
+    
+    logger.info(f"Retired {retired} questions")
+    return schemas.QuestionRetireResult(retired=retired)
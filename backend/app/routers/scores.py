@@ -1,6 +1,6 @@
 import logging
 from fastapi import APIRouter, HTTPException, Depends
-from .. import schemas, database, auth, dependencies
+from .. import schemas, database, auth, dependencies, streaming
 from typing import List
 
 # Set up logging
@@ -12,30 +12,68 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=schemas.ScoreOut)
-def create_new_score(
+async def create_new_score(
     score: schemas.ScoreCreate, 
     current_user: schemas.User = Depends(auth.get_current_user),
-    db: database.Database = Depends(dependencies.get_db)
+    db: database.AsyncDatabase = Depends(dependencies.get_async_db)
 ):
     logger.info(f"User {current_user.user_id} is creating a new score with details: {score}")
     
     try:
-        new_score = db.create_score(score=score, user_id=current_user.user_id)
-        logger.info(f"New score created with id={new_score.id} by user {current_user.user_id}")
+        new_score = await db.create_score(score=score, user_id=current_user.user_id)
+        logger.info(f"New score created with id={new_score.score_id} by user {current_user.user_id}")
         return new_score
     except Exception as e:
         logger.error(f"Error creating new score for user {current_user.user_id}: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while creating the score")
 
+@router.post("/finish-attempt", response_model=schemas.AttemptResult)
+async def finish_attempt(
+    submission: schemas.AttemptSubmission,
+    current_user: schemas.User = Depends(auth.get_current_user),
+    db: database.AsyncDatabase = Depends(dependencies.get_async_db)
+):
+    """
+    Grade a quiz attempt and store its progress and score in one transaction.
+
+    The attempt number is allocated by the server. Returns per-question feedback with
+    the option texts and the section name.
+    """
+    logger.info(f"User {current_user.user_id} is finishing an attempt at section {submission.section_id}")
+
+    try:
+        result = await db.finish_attempt(
+            user_id=current_user.user_id,
+            section_id=submission.section_id,
+            answers=submission.answers,
+            time_taken=submission.time_taken
+        )
+        if result is None:
+            logger.warning(f"Section {submission.section_id} not found")
+            raise HTTPException(status_code=404, detail="Section not found")
+        logger.info(
+            f"User {current_user.user_id} scored {result.score} of {result.total_questions} "
+            f"on attempt {result.attempt_number} at section {submission.section_id}"
+        )
+        return result
+    except HTTPException as he:
+        raise he
+    except ValueError as e:
+        logger.warning(f"Rejected attempt of user {current_user.user_id} at section {submission.section_id}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error finishing attempt for user {current_user.user_id} at section {submission.section_id}: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while finishing the attempt")
+
 @router.get("/my-scores", response_model=List[schemas.ScoreOut])
-def read_user_scores(
+async def read_user_scores(
     current_user: schemas.User = Depends(auth.get_current_user),
-    db: database.Database = Depends(dependencies.get_db)
+    db: database.AsyncDatabase = Depends(dependencies.get_async_db)
 ):
     logger.info(f"Fetching scores for user {current_user.user_id}")
     
     try:
-        scores = db.get_user_scores(user_id=current_user.user_id)
+        scores = await db.get_user_scores(user_id=current_user.user_id)
         if not scores:
             logger.warning(f"No scores found for user {current_user.user_id}")
             raise HTTPException(status_code=404, detail="No scores found for this user")
@@ -45,15 +83,34 @@ def read_user_scores(
         logger.error(f"Error fetching scores for user {current_user.user_id}: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching the scores")
 
+async def _stream_section_scores(section_id: int):
+    # The stream outlives the request's session, so it reads through its own
+    async with database.AsyncDatabase() as db:
+        async for score in db.stream_section_scores(section_id, batch_size=streaming.STREAM_BATCH_SIZE):
+            yield score
+
 @router.get("/section/{section_id}", response_model=List[schemas.ScoreOut])
-def read_section_scores(
+async def read_section_scores(
     section_id: int,
-    db: database.Database = Depends(dependencies.get_db)
+    stream: bool = False
 ):
-    logger.info(f"Fetching scores for section_id={section_id}")
+    """
+    Retrieve every score of a section.
+
+    With `stream=true` the scores are read through a server-side cursor and written as
+    NDJSON, one per line, as they arrive. An empty body means the section has no scores.
+
+    The route opens its session itself rather than through get_async_db: a stream
+    reads through a session of its own that lives as long as the response.
+    """
+    logger.info(f"Fetching scores for section_id={section_id} (stream={stream})")
+
+    if stream:
+        return streaming.ndjson_response(streaming.aiter_ndjson(_stream_section_scores(section_id), schemas.ScoreOut))
     
     try:
-        scores = db.get_section_scores(section_id=section_id)
+        async with database.AsyncDatabase() as db:
+            scores = await db.get_section_scores(section_id=section_id)
         if not scores:
             logger.warning(f"No scores found for section_id={section_id}")
             raise HTTPException(status_code=404, detail="No scores found for this section")
@@ -66,10 +123,10 @@ def read_section_scores(
 
 
 @router.get("/attempts", response_model=int)
-def get_attempt_number(
+async def get_attempt_number(
     section_id: int,
     current_user: schemas.User = Depends(auth.get_current_user),
-    db: database.Database = Depends(dependencies.get_db)
+    db: database.AsyncDatabase = Depends(dependencies.get_async_db)
 ):
     """
     Fetch the current attempt number for the section and user.
@@ -78,7 +135,7 @@ def get_attempt_number(
     
     try:
         # Fetch attempts made by the user for the given section
-        attempts_count = db.get_user_section_attempts_count(user_id=current_user.user_id, section_id=section_id)
+        attempts_count = await db.get_user_section_attempts_count(user_id=current_user.user_id, section_id=section_id)
         
         # If no attempts found, default to 0
         if attempts_count is None:
@@ -1,6 +1,6 @@
 import logging
-from fastapi import APIRouter, HTTPException, Depends
-from .. import schemas, database, dependencies, auth
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from .. import schemas, database, dependencies, auth, http_cache
 from typing import List
 
 # Set up logging
@@ -13,29 +13,28 @@ router = APIRouter(
 
 @router.get("/", response_model=List[schemas.Section])
 def read_sections(
+    request: Request,
+    response: Response,
     db: database.Database = Depends(dependencies.get_db)
 ):
     logger.info("Fetching all sections")
     
+    etag = http_cache.make_etag(db.get_sections_digest())
+    not_modified = http_cache.conditional(request, response, etag, http_cache.PUBLIC_REVALIDATE)
+    if not_modified:
+        return not_modified
+    
     try:
-        # Fetch all sections
-        sections = db.get_sections()  # Assuming it fetches the questions relationship as well
+        # Fetch all sections together with their question counts
+        sections = db.get_sections()
         if not sections:
             logger.warning("No sections found")
             raise HTTPException(status_code=404, detail="No sections found")
         
         logger.info(f"Found {len(sections)} sections")
-        
-        # Return sections with calculated total_questions
-        return [
-            schemas.Section(
-                section_id=section.section_id,
-                name=section.name,
-                description=section.description,
-                total_questions=len(section.questions)  # Assuming questions are eagerly loaded
-            )
-            for section in sections
-        ]
+        return sections
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error fetching sections: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching sections")
@@ -51,7 +50,7 @@ def create_new_section(
     
     try:
         new_section = db.create_section(section=section)
-        logger.info(f"Created new section with id={new_section.id}")
+        logger.info(f"Created new section with id={new_section.section_id}")
         return new_section
     except Exception as e:
         logger.error(f"Error creating new section: {e}")
@@ -60,10 +59,17 @@ def create_new_section(
 @router.get("/{section_id}", response_model=schemas.Section)
 def read_section(
     section_id: int,
+    request: Request,
+    response: Response,
     db: database.Database = Depends(dependencies.get_db)
 ):
     logger.info(f"Fetching section with id={section_id}")
     
+    etag = http_cache.make_etag(db.get_sections_digest(), section_id)
+    not_modified = http_cache.conditional(request, response, etag, http_cache.PUBLIC_REVALIDATE)
+    if not_modified:
+        return not_modified
+    
     try:
         section = db.get_section(section_id=section_id)
         if section is None:
@@ -72,6 +78,8 @@ def read_section(
         
         logger.info(f"Found section with id={section_id}")
         return section
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Error fetching section with id={section_id}: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching the section")
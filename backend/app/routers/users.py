@@ -61,7 +61,8 @@ def login_user(
         
         access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = auth.create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
+            data={"sub": user.username, "user_id": user.user_id, "role": Role(user.role).value, "ver": user.token_version},
+            expires_delta=access_token_expires
         )
         logger.info(f"User {form_data.username} successfully logged in")
         return {"access_token": access_token, "token_type": "bearer"}
@@ -76,3 +77,49 @@ def get_current_user_profile(
 ):
     logger.info(f"Retrieving profile for current user: {current_user.username}")
     return current_user
+
+
+@router.put(
+    "/{user_id}/role",
+    response_model=schemas.User,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+def update_user_role(
+    user_id: int,
+    role_update: schemas.UserRoleUpdate,
+    db: database.Database = Depends(dependencies.get_db)
+):
+    """
+    Change a user's role. Takes effect on the user's existing tokens immediately.
+    """
+    logger.info(f"Changing the role of user {user_id} to {role_update.role.value}")
+
+    try:
+        user = db.update_user_role(user_id=user_id, role=role_update.role)
+        if user is None:
+            logger.warning(f"User {user_id} not found")
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Error changing the role of user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while changing the user's role")
+
+
+@router.post(
+    "/{user_id}/revoke-tokens",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(dependencies.require_role("admin"))]
+)
+def revoke_tokens(
+    user_id: int,
+    db: database.Database = Depends(dependencies.get_db)
+):
+    """
+    Reject every token issued to the user so far. The user has to log in again.
+    """
+    logger.info(f"Revoking tokens issued to user {user_id}")
+    if not db.revoke_user_tokens(user_id=user_id):
+        logger.warning(f"User {user_id} not found")
+        raise HTTPException(status_code=404, detail="User not found")
@@ -0,0 +1,103 @@
+# app/schema_upgrade.py
+"""
+Bring an existing database up to the current models.
+
+Base.metadata.create_all creates missing tables but never alters one that already
+exists, so columns, indexes and unique keys added to existing tables would only appear
+on fresh databases. upgrade_schema() adds them. Every step checks the live schema
+first, so it runs on every startup and can be rerun safely by hand:
+
+    python -m app.schema_upgrade
+"""
+import logging
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn, UniqueConstraint
+
+from .models import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(engine: Engine) -> List[str]:
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    applied = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                # New columns are nullable or carry a server default, so existing rows stay valid
+                definition = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {definition}"))
+                applied.append(f"column {table.name}.{column.name}")
+    return applied
+
+
+def _add_missing_indexes(engine: Engine) -> List[str]:
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    applied = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        existing |= {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            with engine.begin() as conn:
+                index.create(conn)
+            applied.append(f"index {index.name}")
+
+        # Unique constraints are added as unique indexes, which every dialect can create
+        # on an existing table and which back ON CONFLICT / ON DUPLICATE KEY the same way
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint) or not constraint.name or constraint.name in existing:
+                continue
+            columns = ", ".join(preparer.quote(column.name) for column in constraint.columns)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f"CREATE UNIQUE INDEX {preparer.quote(constraint.name)} "
+                        f"ON {preparer.format_table(table)} ({columns})"
+                    ))
+            except Exception as e:
+                # Existing duplicate rows block the key, the rest of the upgrade still applies
+                logger.error(
+                    f"Could not add unique key {constraint.name} to {table.name}, "
+                    f"remove the duplicate rows and restart: {e}"
+                )
+                continue
+            applied.append(f"unique key {constraint.name}")
+    return applied
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """
+    Create missing tables, then add missing columns, indexes and unique keys to the
+    existing ones.
+
+    :return: A description of every change applied, empty when the schema was current.
+    """
+    Base.metadata.create_all(bind=engine)
+    applied = _add_missing_columns(engine) + _add_missing_indexes(engine)
+    for change in applied:
+        logger.info(f"Schema upgrade: added {change}")
+    return applied
+
+
+def main():
+    from .database import engine
+    from .logging_config import setup_logging
+
+    setup_logging()
+    applied = upgrade_schema(engine)
+    logger.info(f"Schema upgrade applied {len(applied)} changes")
+
+
+if __name__ == '__main__':
+    main()
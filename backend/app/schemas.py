@@ -24,6 +24,16 @@ class User(UserBase):
     class Config:
         orm_mode = True
 
+# Schema for an admin changing a user's role
+class UserRoleUpdate(BaseModel):
+    role: Role
+
+# What a token is checked against on every request
+class UserTokenState(BaseModel):
+    username: str
+    role: Role
+    token_version: int
+
 # ---------------- Section Schemas ----------------
 
 class SectionBase(BaseModel):
@@ -71,6 +81,18 @@ class Question(QuestionBase):
     class Config:
         orm_mode = True
 
+class QuestionBulkCreateResult(BaseModel):
+    created: int
+    question_ids: List[int]
+
+# A question's identity for imports: the same content may live in several sections
+class QuestionKey(BaseModel):
+    section_id: int
+    content_hash: str
+
+class QuestionRetireResult(BaseModel):
+    retired: int
+
 # ---------------- Score Schemas ----------------
 
 class ScoreBase(BaseModel):
@@ -81,7 +103,7 @@ class ScoreBase(BaseModel):
 
 
 class ScoreCreate(ScoreBase):
-    pass
+    attempt_number: Optional[int] = None  # Ignored, the server numbers attempts
 
 
 class ScoreOut(ScoreBase):
@@ -109,6 +131,36 @@ class BibleVerse(BibleVerseBase):
     class Config:
         orm_mode = True
 
+class BiblePassage(BaseModel):
+    book_name: str
+    start_chapter: int
+    start_verse: int
+    end_chapter: int
+    end_verse: Optional[int] = None  # None runs to the end of end_chapter
+    version: str
+    verses: List[BibleVerse]
+
+class QuestionPassage(BaseModel):
+    question_id: int
+    bible_reference: Optional[str] = None
+    passage: Optional[BiblePassage] = None  # None when the reference can't be resolved
+
+class BibleSearchHit(BaseModel):
+    verse: BibleVerse
+    score: Optional[float] = None  # BM25 relevance, None when served without the index
+
+class BibleSearchResult(BaseModel):
+    query: str
+    total: int
+    offset: int
+    limit: int
+    hits: List[BibleSearchHit]
+
+class BibleVerseBatchResult(BaseModel):
+    received: int
+    created: int
+    skipped: int
+
 # ---------------- Progress Schemas ----------------
 
 class ProgressBase(BaseModel):
@@ -150,6 +202,25 @@ class ProgressFeedback(BaseModel):
     result: str  # "Correct" or "Incorrect"
     explanation: Optional[str] = None
 
+class AttemptSubmission(ProgressSubmission):
+    time_taken: int = 0  # Time in seconds
+
+class AttemptFeedback(ProgressFeedback):
+    difficulty: Difficulty
+    bible_reference: str
+    options: List[str]
+    user_answer_text: str
+    correct_answer_text: str
+
+class AttemptResult(BaseModel):
+    section_id: int
+    section_name: str
+    score_id: int
+    attempt_number: int
+    score: int  # Number of correct answers
+    total_questions: int  # Active questions in the section
+    feedback: List[AttemptFeedback]  # In the section's question order
+
 
 # ---------------- Leaderboard Schemas ----------------
 
@@ -160,6 +231,11 @@ class UserScore(BaseModel):
     class Config:
         orm_mode = True
 
+class SectionLeaderboard(BaseModel):
+    section_id: int
+    section_name: str
+    leaderboard: List[UserScore]
+
 # ---------------- Achievement Schemas ----------------
 
 class AchievementBase(BaseModel):
@@ -206,4 +282,16 @@ class SectionCompletionDetail(BaseModel):
     final_score: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+# ---------------- Dashboard Schemas ----------------
+
+class DashboardSection(Section):
+    latest_score: Optional[int] = None  # Score of the highest attempt_number
+    best_score: Optional[int] = None
+    attempts: int = 0
+
+class Dashboard(BaseModel):
+    sections: List[DashboardSection]
+    total_sections: int
+    completed_sections: int  # Sections with at least one score
+    remaining_sections: int
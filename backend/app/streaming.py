@@ -0,0 +1,59 @@
+# app/streaming.py
+"""
+Newline-delimited JSON responses for endpoints that can return a whole table.
+
+Rows are encoded and written as they are read, so memory stays flat however many rows
+the response holds. Each line is one JSON object; an empty body means no rows.
+"""
+import os
+from typing import AsyncIterable, Iterable, Optional, Type
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '1000'))
+# Encoded bytes gathered before a chunk is written to the socket
+STREAM_CHUNK_BYTES = int(os.getenv('STREAM_CHUNK_BYTES', '65536'))
+
+
+def _encode(row, schema: Optional[Type[BaseModel]]) -> bytes:
+    if schema is not None and not isinstance(row, schema):
+        row = schema.from_orm(row)
+    return orjson.dumps(row.dict()) + b"\n"
+
+
+def iter_ndjson(rows: Iterable, schema: Optional[Type[BaseModel]] = None) -> Iterable[bytes]:
+    """Encode rows, or ORM objects validated through `schema`, into NDJSON chunks."""
+    chunk = bytearray()
+    for row in rows:
+        chunk += _encode(row, schema)
+        if len(chunk) >= STREAM_CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+async def aiter_ndjson(rows: AsyncIterable, schema: Optional[Type[BaseModel]] = None) -> AsyncIterable[bytes]:
+    """Async counterpart of iter_ndjson."""
+    chunk = bytearray()
+    async for row in rows:
+        chunk += _encode(row, schema)
+        if len(chunk) >= STREAM_CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+def ndjson_response(chunks, headers: Optional[dict] = None) -> StreamingResponse:
+    """
+    Stream encoded chunks from iter_ndjson or aiter_ndjson.
+
+    :param headers: Extra headers, e.g. the ETag set on the route's Response.
+    """
+    return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE, headers=headers)
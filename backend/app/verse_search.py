@@ -0,0 +1,147 @@
+# app/verse_search.py
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    Split a query into clauses: one per quoted phrase and one per bare word.
+
+    'moses "burning bush"' -> [["burning", "bush"], ["moses"]]
+    """
+    clauses = [tokenize(phrase) for phrase in _PHRASE_PATTERN.findall(query)]
+    clauses += [[token] for token in tokenize(_PHRASE_PATTERN.sub(" ", query))]
+    return [clause for clause in clauses if clause]
+
+
+class Postings(NamedTuple):
+    rows: array  # Verse store rows containing the term, ascending
+    offsets: array  # positions[offsets[i]:offsets[i + 1]] are the term's positions in rows[i]
+    positions: array
+
+
+class VerseSearchIndex:
+    """
+    Positional inverted index over the verses of one VerseStore.
+
+    Every clause of a query must match: a word anywhere in the verse, a quoted phrase as
+    consecutive words. Matches are ranked with BM25 over all query words.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lengths = array("H")
+        building = {}
+        for row in range(store.count):
+            tokens = tokenize(store.text_at(row))
+            self.lengths.append(min(len(tokens), 0xFFFF))
+            term_positions = {}
+            for position, token in enumerate(tokens):
+                term_positions.setdefault(token, []).append(position)
+            for token, positions in term_positions.items():
+                rows, offsets, all_positions = building.setdefault(token, ([], [0], []))
+                rows.append(row)
+                all_positions.extend(positions)
+                offsets.append(len(all_positions))
+
+        self.postings = {
+            token: Postings(array("I", rows), array("I", offsets), array("H", (min(p, 0xFFFF) for p in positions)))
+            for token, (rows, offsets, positions) in building.items()
+        }
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def _positions(self, postings: Postings, row: int) -> Optional[array]:
+        index = bisect_left(postings.rows, row)
+        if index == len(postings.rows) or postings.rows[index] != row:
+            return None
+        return postings.positions[postings.offsets[index]:postings.offsets[index + 1]]
+
+    def _has_phrase(self, phrase: List[Postings], row: int) -> bool:
+        starts = set(self._positions(phrase[0], row))
+        for offset, postings in enumerate(phrase[1:], start=1):
+            starts &= {position - offset for position in self._positions(postings, row)}
+            if not starts:
+                return False
+        return True
+
+    def _idf(self, postings: Postings) -> float:
+        matches = len(postings.rows)
+        return math.log(1 + (self.store.count - matches + 0.5) / (matches + 0.5))
+
+    def search(
+        self,
+        query: str,
+        version: Optional[str] = None,
+        book_name: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        Find the verses matching every clause of `query`.
+
+        :param query: Words and "quoted phrases".
+        :param version: Only verses of this translation.
+        :param book_name: Only verses of this book.
+        :param offset: Number of top-ranked matches to skip.
+        :param limit: Maximum number of matches to return.
+        :return: (total matches, [(store row, score)] best first).
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return 0, []
+        version_id = None if version is None else self.store.version_id(version)
+        book_id = None if book_name is None else self.store.book_id(book_name)
+        if (version is not None and version_id is None) or (book_name is not None and book_id is None):
+            return 0, []
+
+        clause_postings = []
+        for clause in clauses:
+            postings = [self.postings.get(token) for token in clause]
+            if any(p is None for p in postings):
+                return 0, []
+            clause_postings.append(postings)
+        terms = {token: postings for clause, postings_list in zip(clauses, clause_postings)
+                 for token, postings in zip(clause, postings_list)}
+
+        # Walk the rarest term's rows and probe the others
+        by_rarity = sorted(terms.values(), key=lambda postings: len(postings.rows))
+        candidates = []
+        for row in by_rarity[0].rows:
+            if version_id is not None or book_id is not None:
+                row_version, row_book = self.store.scope_at(row)
+                if (version_id is not None and row_version != version_id) or (book_id is not None and row_book != book_id):
+                    continue
+            if all(self._positions(postings, row) is not None for postings in by_rarity[1:]):
+                candidates.append(row)
+
+        phrases = [postings for postings in clause_postings if len(postings) > 1]
+        if phrases:
+            candidates = [row for row in candidates if all(self._has_phrase(phrase, row) for phrase in phrases)]
+
+        weights = [(postings, self._idf(postings)) for postings in terms.values()]
+
+        def score(row):
+            length_norm = _K1 * (1 - _B + _B * self.lengths[row] / (self.average_length or 1))
+            total = 0.0
+            for postings, idf in weights:
+                frequency = len(self._positions(postings, row))
+                total += idf * frequency * (_K1 + 1) / (frequency + length_norm)
+            return total
+
+        top = heapq.nlargest(offset + limit, ((score(row), -row) for row in candidates))
+        return len(candidates), [(-negative_row, value) for value, negative_row in top[offset:]]
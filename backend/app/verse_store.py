@@ -0,0 +1,452 @@
+# app/verse_store.py
+"""
+Read-only, in-process copy of the Bible corpus.
+
+Every verse is packed into one buffer: a sorted array of integer keys
+(version << 24 | book << 16 | chapter << 8 | verse), the verse IDs and text offsets
+aligned with it, a verse_id index, and one contiguous UTF-8 text blob. Single verse and
+passage lookups are bisects over the key array and never touch the database.
+
+The buffer is built from the database at startup, or memory-mapped from a file
+prebuilt with:
+
+    python -m app.verse_store --output /data/verses.bin
+
+and VERSE_STORE_PATH=/data/verses.bin. The file is only used while its verses still
+match the database, compared by a digest over every verse's ID, location and text,
+otherwise the store is rebuilt from the database.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+from .bible_reference import PassageRange
+from .enums import BibleBook
+
+logger = logging.getLogger(__name__)
+
+VERSE_STORE_ENABLED = os.getenv('VERSE_STORE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+VERSE_STORE_PATH = os.getenv('VERSE_STORE_PATH')  # Optional prebuilt file to memory-map
+# Seconds between checks that the verse count and highest verse_id still match the database
+VERSE_STORE_CHECK_INTERVAL = float(os.getenv('VERSE_STORE_CHECK_INTERVAL', '60'))
+
+_MAGIC = b"BVS1"
+_PREFIX = struct.Struct("<4sI")  # Magic, header length
+_MAX_FIELD = 0xFF  # Chapters, verses, books and versions each get one byte of the key
+
+
+def _encode_key(version: int, book: int, chapter: int, verse: int) -> int:
+    return version << 24 | book << 16 | chapter << 8 | verse
+
+
+def _content_digest(rows) -> str:
+    """SHA-256 over (verse_id, version, book_name, chapter, verse, UTF-8 text) rows in verse_id order."""
+    digest = hashlib.sha256()
+    for verse_id, version, book_name, chapter, verse, text in rows:
+        digest.update(f"{verse_id}\x1f{version}\x1f{book_name}\x1f{chapter}\x1f{verse}\x1f".encode("utf-8"))
+        digest.update(text)
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class VerseStore:
+    """
+    Lookups over one packed verse buffer, either bytes or a memory map.
+
+    Build one with `from_session` or `open`.
+    """
+
+    def __init__(self, buffer, source: str):
+        self.source = source
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, header_length = _PREFIX.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Not a verse store file")
+        header = json.loads(bytes(view[_PREFIX.size:_PREFIX.size + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("Verse store was built on a machine with a different byte order")
+
+        self.count: int = header["count"]
+        self.max_verse_id: int = header["max_verse_id"]
+        self.content_digest: Optional[str] = header.get("content_digest")  # Absent in older files
+        self.versions: List[str] = header["versions"]
+        self.books: List[str] = header["books"]
+        self._version_index = {name: index for index, name in enumerate(self.versions)}
+        self._book_index = {name: index for index, name in enumerate(self.books)}
+
+        position = header["data_offset"]
+
+        def take(length):
+            nonlocal position
+            section = view[position:position + length * 4].cast("I")
+            position += length * 4
+            return section
+
+        self._keys = take(self.count)
+        self._verse_ids = take(self.count)
+        self._offsets = take(self.count + 1)
+        self._sorted_ids = take(self.count)
+        self._id_rows = take(self.count)
+        self._text = view[position:position + header["text_bytes"]]
+
+        # Identifies the store's content, for ETags on verse responses
+        self.digest = hashlib.sha256(view[_PREFIX.size:]).hexdigest()
+
+        self._search_lock = threading.Lock()
+        self._search_index = None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    # ---------------- Building ----------------
+
+    @staticmethod
+    def pack(rows) -> bytes:
+        """
+        Pack (verse_id, book_name, chapter, verse, version, text) rows into a store buffer.
+
+        :raises ValueError: If a chapter, verse, book or version does not fit in the key.
+        """
+        versions = sorted({row[4] for row in rows})
+        # Canonical book order first, so a version's keys run in reading order
+        known_books = [book.value for book in BibleBook]
+        books = [book for book in known_books if book in {row[1] for row in rows}]
+        books += sorted({row[1] for row in rows} - set(books))
+        if len(versions) > _MAX_FIELD + 1 or len(books) > _MAX_FIELD + 1:
+            raise ValueError("Too many versions or books for the verse key")
+        version_index = {name: index for index, name in enumerate(versions)}
+        book_index = {name: index for index, name in enumerate(books)}
+
+        keyed = []
+        described = []
+        for verse_id, book_name, chapter, verse, version, text in rows:
+            if not (0 <= chapter <= _MAX_FIELD and 0 <= verse <= _MAX_FIELD):
+                raise ValueError(f"{book_name} {chapter}:{verse} does not fit in the verse key")
+            encoded = text.encode("utf-8")
+            keyed.append((
+                _encode_key(version_index[version], book_index[book_name], chapter, verse),
+                verse_id,
+                encoded
+            ))
+            described.append((verse_id, version, book_name, chapter, verse, encoded))
+        keyed.sort()
+        described.sort(key=lambda row: row[0])
+        content_digest = _content_digest(described)
+        del described
+
+        keys = array("I", (key for key, _, _ in keyed))
+        verse_ids = array("I", (verse_id for _, verse_id, _ in keyed))
+        offsets = array("I", [0])
+        for _, _, text in keyed:
+            offsets.append(offsets[-1] + len(text))
+        id_rows = array("I", sorted(range(len(keyed)), key=lambda row: verse_ids[row]))
+        sorted_ids = array("I", (verse_ids[row] for row in id_rows))
+        if keys.itemsize != 4:
+            raise ValueError("Verse store needs 4-byte unsigned ints")
+
+        def header_bytes(data_offset):
+            return json.dumps({
+                "count": len(keyed),
+                "max_verse_id": max(verse_ids, default=0),
+                "content_digest": content_digest,
+                "versions": versions,
+                "books": books,
+                "byteorder": sys.byteorder,
+                "text_bytes": offsets[-1],
+                "data_offset": data_offset,
+            }).encode("utf-8")
+
+        # The arrays start on a 4-byte boundary after the header
+        header = header_bytes(0)
+        data_offset = _PREFIX.size + len(header) + 16
+        data_offset += -data_offset % 4
+        header = header_bytes(data_offset).ljust(data_offset - _PREFIX.size)
+
+        return b"".join([
+            _PREFIX.pack(_MAGIC, len(header)),
+            header,
+            keys.tobytes(),
+            verse_ids.tobytes(),
+            offsets.tobytes(),
+            sorted_ids.tobytes(),
+            id_rows.tobytes(),
+            b"".join(text for _, _, text in keyed),
+        ])
+
+    @staticmethod
+    def _rows(session: Session):
+        return session.query(
+            models.BibleVerse.verse_id,
+            models.BibleVerse.book_name,
+            models.BibleVerse.chapter,
+            models.BibleVerse.verse,
+            models.BibleVerse.version,
+            models.BibleVerse.text
+        ).yield_per(5000)
+
+    @classmethod
+    def from_session(cls, session: Session) -> "VerseStore":
+        """Build a store from every verse in the database."""
+        return cls(cls.pack([tuple(row) for row in cls._rows(session)]), source="database")
+
+    @classmethod
+    def open(cls, path: str) -> "VerseStore":
+        """Memory-map a prebuilt store file."""
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, source=path)
+
+    def matches_size(self, session: Session) -> bool:
+        """Whether the database still has the same verse count and highest verse_id. One cheap query."""
+        count, max_verse_id = session.query(
+            func.count(models.BibleVerse.verse_id),
+            func.max(models.BibleVerse.verse_id)
+        ).one()
+        return count == self.count and (max_verse_id or 0) == self.max_verse_id
+
+    def matches(self, session: Session) -> bool:
+        """
+        Whether the store holds exactly the verses in the database, including edits that
+        keep the count and IDs, by comparing content digests. Streams the verse table once.
+        """
+        if self.content_digest is None or not self.matches_size(session):
+            return False
+        rows = session.query(
+            models.BibleVerse.verse_id,
+            models.BibleVerse.version,
+            models.BibleVerse.book_name,
+            models.BibleVerse.chapter,
+            models.BibleVerse.verse,
+            models.BibleVerse.text
+        ).order_by(models.BibleVerse.verse_id).yield_per(5000)
+        digest = _content_digest(
+            (verse_id, version, book_name, chapter, verse, text.encode("utf-8"))
+            for verse_id, version, book_name, chapter, verse, text in rows
+        )
+        return digest == self.content_digest
+
+    # ---------------- Lookups ----------------
+
+    def verse_at(self, row: int) -> schemas.BibleVerse:
+        key = self._keys[row]
+        return schemas.BibleVerse(
+            verse_id=self._verse_ids[row],
+            version=self.versions[key >> 24],
+            book_name=self.books[key >> 16 & _MAX_FIELD],
+            chapter=key >> 8 & _MAX_FIELD,
+            verse=key & _MAX_FIELD,
+            text=self.text_at(row)
+        )
+
+    def text_at(self, row: int) -> str:
+        return str(self._text[self._offsets[row]:self._offsets[row + 1]], "utf-8")
+
+    def scope_at(self, row: int):
+        """(version, book) positions of a row, comparable with version_id() and book_id()."""
+        key = self._keys[row]
+        return key >> 24, key >> 16 & _MAX_FIELD
+
+    def version_id(self, version: str) -> Optional[int]:
+        return self._version_index.get(version)
+
+    def book_id(self, book_name: str) -> Optional[int]:
+        return self._book_index.get(book_name)
+
+    @property
+    def search_index(self):
+        """Full-text index over this store's verses, built on first use."""
+        with self._search_lock:
+            if self._search_index is None:
+                from .verse_search import VerseSearchIndex
+                self._search_index = VerseSearchIndex(self)
+            return self._search_index
+
+    def get_by_id(self, verse_id: int) -> Optional[schemas.BibleVerse]:
+        index = bisect_left(self._sorted_ids, verse_id)
+        if index == len(self._sorted_ids) or self._sorted_ids[index] != verse_id:
+            return None
+        return self.verse_at(self._id_rows[index])
+
+    def get_passage(self, passage: PassageRange, version: str) -> List[schemas.BibleVerse]:
+        """Every verse of the passage in reading order."""
+        version_index = self._version_index.get(version)
+        book_index = self._book_index.get(passage.book_name)
+        if version_index is None or book_index is None or passage.start_chapter > _MAX_FIELD:
+            return []
+        low = _encode_key(version_index, book_index, passage.start_chapter, min(passage.start_verse, _MAX_FIELD))
+        end_chapter = min(passage.end_chapter, _MAX_FIELD)
+        end_verse = _MAX_FIELD if passage.end_verse is None else min(passage.end_verse, _MAX_FIELD)
+        high = _encode_key(version_index, book_index, end_chapter, end_verse)
+        return [
+            self.verse_at(row)
+            for row in range(bisect_left(self._keys, low), bisect_right(self._keys, high))
+        ]
+
+
+class VerseStoreHolder:
+    """
+    Process-wide slot for the current VerseStore.
+
+    Writers call invalidate() after committing a verse change. Lookups fall back to the
+    database until a background rebuild has caught up with the latest invalidation.
+
+    Verses written outside the API, e.g. by init-db/fast_load.py, are picked up by the
+    periodic check in current(), or straight away with POST /health/verse-store/refresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._store: Optional[VerseStore] = None
+        self._generation = 0
+        self._rebuilding = False
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._checked_at = 0.0
+
+    def get(self) -> Optional[VerseStore]:
+        return self._store
+
+    def current(self, session: Session) -> Optional[VerseStore]:
+        """
+        The store, or None when it is not loaded or no longer matches the database.
+
+        At most every VERSE_STORE_CHECK_INTERVAL seconds the verse count and highest
+        verse_id are compared with the database. A store that is out of date is dropped
+        and rebuilt in the background, and a missing one is built once verses exist.
+        """
+        store = self._store
+        now = time.monotonic()
+        if now - self._checked_at < VERSE_STORE_CHECK_INTERVAL:
+            return store
+        self._checked_at = now
+        if store is None:
+            # Started before any verses were loaded, build once they are there
+            if self._session_factory is not None and not self._rebuilding and session.query(
+                func.count(models.BibleVerse.verse_id)
+            ).scalar():
+                logger.info("Verses found in the database, building the verse store")
+                self.invalidate()
+            return None
+        if store.matches_size(session):
+            return store
+        logger.warning("Verse store is out of date with the database, rebuilding it")
+        self.invalidate()
+        return None
+
+    def load(self, session_factory: Callable[[], Session], path: Optional[str] = VERSE_STORE_PATH):
+        """Install a store at startup, from `path` when it is current, else from the database."""
+        self._session_factory = session_factory
+        start = time.perf_counter()
+        session = session_factory()
+        try:
+            store = None
+            if path and os.path.exists(path):
+                store = VerseStore.open(path)
+                if not store.matches(session):
+                    logger.warning(f"Verse store file {path} is out of date with the database, rebuilding")
+                    store = None
+            if store is None:
+                store = VerseStore.from_session(session)
+        finally:
+            session.close()
+        if store.count == 0:
+            # Nothing to serve yet, lookups use the database until verses are loaded
+            logger.info("No verses in the database, the verse store stays unloaded")
+            return
+        # Build the search index before the store goes live, so no request pays for it
+        store.search_index
+        with self._lock:
+            self._store = store
+            self._checked_at = time.monotonic()
+        logger.info(
+            f"Loaded {store.count} verses ({store.nbytes / 1e6:.1f} MB) from {store.source} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    def invalidate(self):
+        with self._lock:
+            self._store = None
+            self._generation += 1
+            if self._session_factory is None or self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name="verse-store-rebuild", daemon=True).start()
+
+    def _rebuild(self):
+        while True:
+            with self._lock:
+                generation = self._generation
+            session = self._session_factory()
+            try:
+                store = VerseStore.from_session(session)
+                store.search_index
+            except Exception as e:
+                logger.error(f"Error rebuilding the verse store, serving verses from the database: {e}")
+                with self._lock:
+                    self._rebuilding = False
+                return
+            finally:
+                session.close()
+            with self._lock:
+                # Verses written while building make this copy stale, build again
+                if generation == self._generation:
+                    self._store = store if store.count else None
+                    self._checked_at = time.monotonic()
+                    self._rebuilding = False
+                    return
+
+    def stats(self) -> dict:
+        store = self._store
+        stats = {
+            "enabled": self._session_factory is not None,
+            "loaded": store is not None,
+            "rebuilding": self._rebuilding,
+            "generation": self._generation,
+        }
+        if store is not None:
+            stats.update(source=store.source, verses=store.count, bytes=store.nbytes, digest=store.digest)
+        return stats
+
+
+verse_store = VerseStoreHolder()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prebuild the verse store file from the database.")
+    parser.add_argument("--output", required=True, help="Path of the store file to write.")
+    args = parser.parse_args()
+
+    from .database import SessionLocal
+    from .logging_config import setup_logging
+
+    setup_logging()
+    start = time.perf_counter()
+    session = SessionLocal()
+    try:
+        store = VerseStore.from_session(session)
+    finally:
+        session.close()
+    temp_path = args.output + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(store._buffer)
+    os.replace(temp_path, args.output)
+    logger.info(f"Wrote {store.count} verses ({store.nbytes / 1e6:.1f} MB) to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
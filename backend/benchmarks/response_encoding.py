@@ -0,0 +1,114 @@
+"""
+Bytes on the wire and serialisation time for the largest JSON responses.
+
+Seeds a throwaway SQLite database with a synthetic question bank and verse corpus, then
+for each endpoint compares the stdlib JSON encoder with orjson, and identity with gzip
+and brotli encoding:
+
+    cd backend && python benchmarks/response_encoding.py --questions 3000 --verses 5000
+
+Set DATABASE_URL to benchmark against an existing database instead (it must already hold
+an admin user named by --admin).
+"""
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+_temp_dir = None
+if "DATABASE_URL" not in os.environ:
+    _temp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{_temp_dir.name}/benchmark.db"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database, schemas  # noqa: E402
+from app.enums import Difficulty, Role, Topics  # noqa: E402
+from app.main import app  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def seed(questions: int, verses: int, admin: str, password: str):
+    with database.Database() as db:
+        db.create_user(schemas.UserCreate(username=admin, password=password), role=Role.admin)
+        for index in range(4):
+            db.create_section(schemas.SectionCreate(name=f"Section {index + 1}", description="Benchmark section"))
+        db.bulk_create_questions([
+            schemas.QuestionCreate(
+                section_id=1 + index % 4,
+                question_text=f"Which king of Israel reigned in the year numbered {index} of this benchmark?",
+                option1="David", option2="Solomon", option3="Saul", option4="Jeroboam",
+                correct_option=1 + index % 4,
+                bible_reference=f"1 Kings {1 + index % 22}:{1 + index % 30}",
+                difficulty=Difficulty.intermediate,
+                topic=list(Topics)[index % len(Topics)],
+                hint="Look at the start of the chapter."
+            )
+            for index in range(questions)
+        ])
+        db.bulk_create_bible_verses([
+            schemas.BibleVerseCreate(
+                book_name="Genesis",
+                chapter=1 + index // 100,
+                verse=1 + index % 100,
+                text="And God said, Let there be light: and there was light. " * 2,
+                version="KJV"
+            )
+            for index in range(verses)
+        ])
+
+
+def timed(function, repeat: int) -> float:
+    """Best of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON encoders and compression per endpoint.")
+    parser.add_argument("--questions", type=int, default=3000)
+    parser.add_argument("--verses", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--admin", default="benchmark-admin")
+    parser.add_argument("--password", default="benchmark-password")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        if _temp_dir is not None:
+            seed(args.questions, args.verses, args.admin, args.password)
+        token = client.post("/users/login", data={"username": args.admin, "password": args.password}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        endpoints = ["/sections/", "/questions/section/1", "/questions/", "/bible/?limit=1000"]
+        print(f"{'endpoint':<24}{'json ms':>9}{'orjson ms':>11}{'identity B':>12}{'gzip B':>10}{'br B':>10}{'request ms':>12}{'br request ms':>15}")
+        for path in endpoints:
+            data = jsonable_encoder(client.get(path, headers={**headers, "Accept-Encoding": "identity"}).json())
+            stdlib_ms = timed(lambda: JSONResponse(data), args.repeat)
+            orjson_ms = timed(lambda: ORJSONResponse(data), args.repeat)
+            body = ORJSONResponse(data).body
+            gzip_size = len(gzip.compress(body, compresslevel=9))
+            brotli_size = len(brotli.compress(body, quality=4)) if brotli else None
+            identity_ms = timed(lambda: client.get(path, headers={**headers, "Accept-Encoding": "identity"}), args.repeat)
+            encoded_ms = timed(lambda: client.get(path, headers={**headers, "Accept-Encoding": "br, gzip"}), args.repeat)
+            print(
+                f"{path:<24}{stdlib_ms:>9.2f}{orjson_ms:>11.2f}{len(body):>12}{gzip_size:>10}"
+                f"{brotli_size if brotli_size is not None else '-':>10}{identity_ms:>12.2f}{encoded_ms:>15.2f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# tests/conftest.py
+"""
+Run the backend against a throwaway SQLite database.
+
+    cd backend && python -m pytest tests
+"""
+import os
+import tempfile
+
+# The engines are created when app.database is imported, so point them at SQLite first
+_database_path = os.path.join(tempfile.mkdtemp(prefix="bible_trivia_tests_"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_path}"
+os.environ.setdefault("VERSE_STORE_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database, schemas
+from app.enums import Difficulty, Role, Topics
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user():
+    """Create a user with a unique name and return it with its password."""
+    created = []
+
+    def make(role: Role = Role.user):
+        username = f"user{len(created)}_{os.urandom(4).hex()}"
+        with database.Database() as db:
+            user = db.create_user(schemas.UserCreate(username=username, password="password"), role=role)
+            created.append(user.user_id)
+            return schemas.User.from_orm(user), "password"
+
+    return make
+
+
+@pytest.fixture
+def login(client):
+    """Log in and return the Authorization header."""
+    def log_in(username: str, password: str) -> dict:
+        response = client.post("/users/login", data={"username": username, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return log_in
+
+
+@pytest.fixture
+def make_section():
+    """Create a section with `count` questions whose correct option is 1."""
+    def make(count: int = 3):
+        with database.Database() as db:
+            section = db.create_section(schemas.SectionCreate(name=f"Section {os.urandom(4).hex()}"))
+            question_ids = db.bulk_create_questions([
+                schemas.QuestionCreate(
+                    section_id=section.section_id,
+                    question_text=f"Question {number} of {section.name}",
+                    option1="a", option2="b", option3="c", option4="d",
+                    correct_option=1,
+                    bible_reference="John 3:16",
+                    difficulty=Difficulty.beginner,
+                    topic=Topics.joseph_story,
+                )
+                for number in range(count)
+            ])
+            return section.section_id, question_ids
+
+    return make
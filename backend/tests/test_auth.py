@@ -0,0 +1,104 @@
+# tests/test_auth.py
+from app import auth, database, models
+from app.enums import Role
+
+ADMIN_ONLY = "/health/content-snapshot"
+
+
+def test_demoted_admin_loses_admin_rights_on_existing_token(client, make_user, login):
+    admin, password = make_user(Role.admin)
+    other_admin, other_password = make_user(Role.admin)
+    token = login(admin.username, password)
+    assert client.get(ADMIN_ONLY, headers=token).status_code == 200
+
+    response = client.put(
+        f"/users/{admin.user_id}/role",
+        json={"role": Role.user.value},
+        headers=login(other_admin.username, other_password)
+    )
+    assert response.status_code == 200
+    assert response.json()["role"] == Role.user.value
+
+    # The token still claims admin, but the role change forces a database check
+    assert client.get(ADMIN_ONLY, headers=token).status_code == 403
+    assert client.get("/users/me", headers=token).json()["role"] == Role.user.value
+
+
+def test_promoted_user_gains_admin_rights_on_existing_token(client, make_user, login):
+    user, password = make_user()
+    admin, admin_password = make_user(Role.admin)
+    token = login(user.username, password)
+    assert client.get(ADMIN_ONLY, headers=token).status_code == 403
+
+    client.put(f"/users/{user.user_id}/role", json={"role": Role.admin.value}, headers=login(admin.username, admin_password))
+
+    assert client.get(ADMIN_ONLY, headers=token).status_code == 200
+
+
+def test_role_change_of_unknown_user_is_404(client, make_user, login):
+    admin, password = make_user(Role.admin)
+    response = client.put("/users/999999/role", json={"role": Role.user.value}, headers=login(admin.username, password))
+    assert response.status_code == 404
+
+
+def test_login_right_after_revoke_is_accepted(client, make_user, login):
+    user, password = make_user()
+    admin, admin_password = make_user(Role.admin)
+    old_token = login(user.username, password)
+
+    response = client.post(f"/users/{user.user_id}/revoke-tokens", headers=login(admin.username, admin_password))
+    assert response.status_code == 204
+    # Issued within the same second as the revocation, but after it
+    new_token = login(user.username, password)
+
+    assert client.get("/users/me", headers=old_token).status_code == 401
+    assert client.get("/users/me", headers=new_token).status_code == 200
+
+
+def test_changes_made_elsewhere_apply_once_the_cache_expires(client, make_user, login, monkeypatch):
+    user, password = make_user()
+    admin, admin_password = make_user(Role.admin)
+    token = login(admin.username, admin_password)
+    user_token = login(user.username, password)
+    assert client.get(ADMIN_ONLY, headers=token).status_code == 200
+
+    # As another worker would: write to the database without touching this process's cache
+    with database.Database() as db:
+        db.db.query(models.User).filter(models.User.user_id == admin.user_id).update({models.User.role: Role.user})
+        db.db.query(models.User).filter(models.User.user_id == user.user_id).update(
+            {models.User.token_version: models.User.token_version + 1}
+        )
+        db.db.commit()
+
+    monkeypatch.setattr(auth, "USER_STATE_CACHE_TTL", 0)
+    assert client.get(ADMIN_ONLY, headers=token).status_code == 403
+    assert client.get("/users/me", headers=user_token).status_code == 401
+
+
+def test_revocation_survives_a_restart(client, make_user, login):
+    user, password = make_user()
+    admin, admin_password = make_user(Role.admin)
+    token = login(user.username, password)
+    client.post(f"/users/{user.user_id}/revoke-tokens", headers=login(admin.username, admin_password))
+
+    # A restarted process starts with an empty cache
+    auth.user_state_cache.clear()
+    assert client.get("/users/me", headers=token).status_code == 401
+
+
+def test_deleted_user_is_rejected(client, make_user, login):
+    user, password = make_user()
+    token = login(user.username, password)
+    assert client.get("/users/me", headers=token).status_code == 200
+
+    with database.Database() as db:
+        db.db.query(models.User).filter(models.User.user_id == user.user_id).delete()
+        db.db.commit()
+    auth.forget_user(user.user_id)
+
+    assert client.get("/users/me", headers=token).status_code == 401
+
+
+def test_revoking_an_unknown_user_is_404(client, make_user, login):
+    admin, password = make_user(Role.admin)
+    assert client.post("/users/999999/revoke-tokens", headers=login(admin.username, password)).status_code == 404
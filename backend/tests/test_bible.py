@@ -0,0 +1,66 @@
+# tests/test_bible.py
+from app import database, models, schemas
+
+
+def _add_verses(version: str, count: int):
+    with database.Database() as db:
+        db.bulk_create_bible_verses([
+            schemas.BibleVerseCreate(book_name="John", chapter=1, verse=verse, text=f"Verse {verse}", version=version)
+            for verse in range(1, count + 1)
+        ])
+
+
+def test_verse_pages_are_lists_with_a_cursor_header(client, make_user, login):
+    _add_verses("PAGE", 5)
+    user, password = make_user()
+    token = login(user.username, password)
+
+    first = client.get("/bible/", params={"version": "PAGE", "limit": 2}, headers=token)
+    assert [verse["verse"] for verse in first.json()] == [1, 2]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/bible/", params={"version": "PAGE", "limit": 2, "cursor": cursor}, headers=token)
+    assert [verse["verse"] for verse in second.json()] == [3, 4]
+
+    last = client.get("/bible/", params={"version": "PAGE", "limit": 2, "cursor": second.headers["X-Next-Cursor"]}, headers=token)
+    assert [verse["verse"] for verse in last.json()] == [5]
+    assert "X-Next-Cursor" not in last.headers
+
+    # Offset paging still works for older clients
+    skipped = client.get("/bible/", params={"version": "PAGE", "limit": 2, "skip": 2}, headers=token)
+    assert skipped.json() == second.json()
+
+
+def test_verse_page_etag_follows_the_rows_served(client, make_user, login):
+    _add_verses("ETAG", 2)
+    user, password = make_user()
+    token = login(user.username, password)
+    params = {"version": "ETAG"}
+
+    first = client.get("/bible/", params=params, headers=token)
+    etag = first.headers["ETag"]
+    assert client.get("/bible/", params=params, headers={**token, "If-None-Match": etag}).status_code == 304
+
+    # Edited outside the API, so no verse store invalidation runs
+    with database.Database() as db:
+        db.db.query(models.BibleVerse).filter(models.BibleVerse.version == "ETAG", models.BibleVerse.verse == 1).update(
+            {models.BibleVerse.text: "Edited"}
+        )
+        db.db.commit()
+
+    edited = client.get("/bible/", params=params, headers={**token, "If-None-Match": etag})
+    assert edited.status_code == 200
+    assert edited.json()[0]["text"] == "Edited"
+
+
+def test_database_search_treats_like_wildcards_literally(client, make_user, login):
+    with database.Database() as db:
+        db.bulk_create_bible_verses([
+            schemas.BibleVerseCreate(book_name="Jude", chapter=1, verse=1, text="plain words", version="LIKE"),
+            schemas.BibleVerseCreate(book_name="Jude", chapter=1, verse=2, text="snake_case words", version="LIKE"),
+        ])
+        # The verse store is off in the tests, so this is the LIKE fallback
+        assert [hit.verse.verse for hit in db.search_bible_verses("_", version="LIKE").hits] == [2]
+        assert [hit.verse.verse for hit in db.search_bible_verses("e_c", version="LIKE").hits] == [2]
+        assert db.search_bible_verses("n_w", version="LIKE").total == 0
+        assert db.search_bible_verses("words", version="LIKE").total == 2
@@ -0,0 +1,56 @@
+# tests/test_database.py
+import asyncio
+import inspect
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app import database
+
+
+def test_pool_counts_only_checkouts_that_queued(tmp_path):
+    statistics = database.PoolStatistics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=database._instrumented_pool(QueuePool, statistics),
+        pool_size=1,
+        max_overflow=0,
+    )
+    statistics.attach(engine)
+
+    # A free connection is not a wait, whether new or reused
+    for _ in range(3):
+        engine.connect().close()
+    assert statistics.as_dict()["waits"] == 0
+
+    held = engine.connect()
+    threading.Timer(0.2, held.close).start()
+    engine.connect().close()
+
+    stats = statistics.as_dict()
+    assert stats["waits"] == 1
+    assert stats["max_wait_ms"] >= 100
+    assert stats["checkouts"] == 5
+
+
+def test_async_wrappers_match_the_sync_methods():
+    wrappers = [
+        name for name, member in vars(database.AsyncDatabase).items()
+        if not name.startswith("_") and inspect.iscoroutinefunction(member) and name != "close"
+    ]
+    assert wrappers
+    for name in wrappers:
+        sync_parameters = inspect.signature(getattr(database.Database, name)).parameters
+        async_parameters = inspect.signature(getattr(database.AsyncDatabase, name)).parameters
+        assert list(async_parameters) == list(sync_parameters), name
+
+
+def test_async_wrapper_runs_on_the_async_session(client, make_user):
+    user, _ = make_user()
+
+    async def read():
+        async with database.AsyncDatabase() as db:
+            return await db.get_user_by_username(username=user.username)
+
+    assert asyncio.run(read()).user_id == user.user_id
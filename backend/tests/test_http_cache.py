@@ -0,0 +1,45 @@
+# tests/test_http_cache.py
+from app import http_cache
+
+
+def test_etags_are_weak_and_stable():
+    etag = http_cache.make_etag("digest", 1)
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == http_cache.make_etag("digest", 1)
+    assert etag != http_cache.make_etag("digest", 2)
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = http_cache.make_etag("digest")
+    strong = etag.removeprefix("W/")
+    assert http_cache._matches(etag, etag)
+    assert http_cache._matches(strong, etag)
+    assert http_cache._matches(f'"other", {etag}', etag)
+    assert http_cache._matches("*", etag)
+    assert not http_cache._matches('W/"other"', etag)
+
+
+def test_same_etag_for_every_encoding_and_304_on_revalidation(client, make_section):
+    make_section(count=40)  # Enough rows for the compression minimum size
+
+    responses = {
+        encoding: client.get("/questions/", headers={"Accept-Encoding": encoding})
+        for encoding in ("gzip", "identity")
+    }
+    assert responses["gzip"].headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in responses["identity"].headers
+    etags = {response.headers["ETag"] for response in responses.values()}
+    assert len(etags) == 1
+    for response in responses.values():
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+    etag = etags.pop()
+    revalidated = client.get("/questions/", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.headers["Vary"] == "Accept-Encoding"
+    assert revalidated.content == b""
+
+    # Content changes produce a new tag
+    make_section(count=1)
+    assert client.get("/questions/", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,31 @@
+# tests/test_leaderboard_backfill.py
+from app import database, models, schemas
+
+
+def test_startup_backfill_restores_counters_and_totals(client, make_user, login):
+    user, password = make_user()
+    with database.Database() as db:
+        section = db.create_section(schemas.SectionCreate(name=f"Backfill {user.username}"))
+        section_id = section.section_id
+        for score in (3, 4):
+            db.create_score(schemas.ScoreCreate(section_id=section_id, score=score, time_taken=10), user_id=user.user_id)
+
+        # As on a database created before the aggregate tables existed
+        db.db.query(models.SectionUserAttempt).delete()
+        db.db.query(models.SectionUserTotal).delete()
+        db.db.query(models.UserTotal).delete()
+        db.db.commit()
+
+        assert db.backfill_leaderboard_totals() > 0
+        assert db.backfill_leaderboard_totals() == 0
+
+    token = login(user.username, password)
+    assert client.get("/scores/attempts", params={"section_id": section_id}, headers=token).json() == 2
+
+    response = client.post("/scores/", json={"section_id": section_id, "score": 5, "time_taken": 10}, headers=token)
+    assert response.status_code == 200, response.text
+    assert response.json()["attempt_number"] == 3
+
+    with database.Database() as db:
+        total = db.db.query(models.UserTotal.total_score).filter(models.UserTotal.user_id == user.user_id).scalar()
+    assert total == 12
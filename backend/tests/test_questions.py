@@ -0,0 +1,73 @@
+# tests/test_questions.py
+from app import database, models, schemas
+from app.enums import Difficulty, Role, Topics
+
+
+def _question(section_id: int, text: str) -> schemas.QuestionCreate:
+    return schemas.QuestionCreate(
+        section_id=section_id,
+        question_text=text,
+        option1="a", option2="b", option3="c", option4="d",
+        correct_option=1,
+        bible_reference="John 3:16",
+        difficulty=Difficulty.beginner,
+        topic=Topics.joseph_story,
+    )
+
+
+def test_inserted_question_ids_follow_payload_order():
+    with database.Database() as db:
+        section = db.create_section(schemas.SectionCreate(name="Bulk read back"))
+        questions = [_question(section.section_id, text) for text in ("one", "two", "one", "three")]
+        question_ids = db.bulk_create_questions(questions)
+        # Leave a gap, as another transaction's insert or a non-consecutive lock mode would
+        db.db.query(models.Question).filter(models.Question.question_id == question_ids[1]).delete()
+        db.db.commit()
+
+        rows = [db._question_values(question) for question in questions]
+        del rows[1]
+        expected = question_ids[:1] + question_ids[2:]
+        assert db._inserted_question_ids(rows, first_question_id=question_ids[0]) == expected
+
+
+def test_retire_is_scoped_to_the_section(client, make_user, login):
+    admin, password = make_user(Role.admin)
+    token = login(admin.username, password)
+    with database.Database() as db:
+        first = db.create_section(schemas.SectionCreate(name="Retire first")).section_id
+        second = db.create_section(schemas.SectionCreate(name="Retire second")).section_id
+        db.bulk_create_questions([_question(first, "shared"), _question(second, "shared")])
+
+    keys = [key for key in client.get("/questions/hashes", headers=token).json() if key["section_id"] in (first, second)]
+    assert len(keys) == 2 and keys[0]["content_hash"] == keys[1]["content_hash"]
+
+    retire = [key for key in keys if key["section_id"] == first]
+    response = client.post("/questions/retire", json=retire, headers=token)
+    assert response.json() == {"retired": 1}
+
+    remaining = [key for key in client.get("/questions/hashes", headers=token).json() if key["section_id"] in (first, second)]
+    assert remaining == [key for key in keys if key["section_id"] == second]
+
+
+def test_snapshot_picks_up_writes_from_other_processes(client, monkeypatch):
+    from app import content_snapshot as snapshot_module
+    from app.content_snapshot import content_snapshot
+
+    with database.Database() as db:
+        section_id = db.create_section(schemas.SectionCreate(name="Written elsewhere")).section_id
+        before = len(db.get_sections())
+
+        # Insert without going through Database, as fast_load.py or another worker would
+        db.db.add(models.Section(name="Out of band"))
+        db.db.add(models.Question(**db._question_values(_question(section_id, "out of band"))))
+        db.db.commit()
+
+        monkeypatch.setattr(snapshot_module, "CONTENT_SNAPSHOT_CHECK_INTERVAL", 3600)
+        assert len(db.get_sections()) == before
+
+        monkeypatch.setattr(snapshot_module, "CONTENT_SNAPSHOT_CHECK_INTERVAL", 0)
+        assert len(db.get_sections()) == before + 1
+        assert db.get_section(section_id).total_questions == 1
+        version = content_snapshot.stats()["version"]
+        db.get_sections()
+        assert content_snapshot.stats()["version"] == version
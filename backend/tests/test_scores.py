@@ -0,0 +1,72 @@
+# tests/test_scores.py
+import json
+
+from app import database, schemas
+
+
+def _section(name: str) -> int:
+    with database.Database() as db:
+        return db.create_section(schemas.SectionCreate(name=name)).section_id
+
+
+def test_section_scores_as_list_and_stream(client, make_user, login):
+    user, password = make_user()
+    token = login(user.username, password)
+    section_id = _section(f"Scores {user.username}")
+    assert client.get(f"/scores/section/{section_id}", params={"stream": True}).text == ""
+
+    for score in (1, 2, 3):
+        client.post("/scores/", json={"section_id": section_id, "score": score, "time_taken": 5}, headers=token)
+
+    listed = client.get(f"/scores/section/{section_id}").json()
+    streamed = client.get(f"/scores/section/{section_id}", params={"stream": True})
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in streamed.text.splitlines()] == listed
+    assert [score["score"] for score in listed] == [1, 2, 3]
+
+
+def test_attempts_are_numbered_across_both_score_routes(client, make_user, make_section, login):
+    user, password = make_user()
+    token = login(user.username, password)
+    section_id, question_ids = make_section()
+
+    numbers = [client.post("/scores/", json={"section_id": section_id, "score": 1, "time_taken": 5}, headers=token).json()["attempt_number"]]
+    numbers.append(client.post(
+        "/scores/finish-attempt", json={"section_id": section_id, "answers": {question_ids[0]: 1}}, headers=token
+    ).json()["attempt_number"])
+    numbers.append(client.post("/scores/", json={"section_id": section_id, "score": 0, "time_taken": 5}, headers=token).json()["attempt_number"])
+
+    assert numbers == [1, 2, 3]
+    assert client.get("/scores/attempts", params={"section_id": section_id}, headers=token).json() == 3
+
+
+def test_finish_attempt_updates_totals(client, make_user, make_section, login):
+    user, password = make_user()
+    token = login(user.username, password)
+    section_id, question_ids = make_section()
+
+    answers = {question_ids[0]: 1, question_ids[1]: 1, question_ids[2]: 2}
+    response = client.post(
+        "/scores/finish-attempt", json={"section_id": section_id, "answers": answers, "time_taken": 42}, headers=token
+    )
+    result = response.json()
+    assert (result["score"], result["total_questions"], len(result["feedback"])) == (2, 3, 3)
+
+    leaderboard = client.get(f"/leaderboard/section/{section_id}").json()
+    assert leaderboard == [{"username": user.username, "total_score": 2}]
+    scores = client.get("/scores/my-scores", headers=token).json()
+    assert [(score["score"], score["time_taken"]) for score in scores if score["section_id"] == section_id] == [(2, 42)]
+
+
+def test_empty_attempt_is_rejected_and_not_recorded(client, make_user, make_section, login):
+    user, password = make_user()
+    token = login(user.username, password)
+    section_id, _ = make_section()
+    _, other_question_ids = make_section()
+
+    for answers in ({}, {other_question_ids[0]: 1}):
+        response = client.post("/scores/finish-attempt", json={"section_id": section_id, "answers": answers}, headers=token)
+        assert response.status_code == 400
+
+    assert client.get("/scores/attempts", params={"section_id": section_id}, headers=token).json() == 0
+    assert client.get(f"/leaderboard/section/{section_id}").status_code == 404
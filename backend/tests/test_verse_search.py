@@ -0,0 +1,53 @@
+# tests/test_verse_search.py
+from app.verse_search import VerseSearchIndex, parse_query, tokenize
+from app.verse_store import VerseStore
+
+ROWS = [
+    (1, "Exodus", 3, 2, "KJV", "the angel appeared in a flame of fire out of the midst of a bush and the bush burned"),
+    (2, "Exodus", 3, 3, "KJV", "Moses said I will now turn aside and see why the bush is not burnt"),
+    (3, "Exodus", 3, 4, "KJV", "God called unto him out of the midst of the bush and said Moses Moses"),
+    (4, "Exodus", 3, 5, "KJV", "put off thy shoes for the place is holy ground"),
+    (5, "Exodus", 3, 2, "ASV", "the angel of Jehovah appeared unto him in a flame of fire out of the midst of a bush"),
+    (6, "Psalms", 23, 1, "KJV", "The LORD is my shepherd I shall not want"),
+]
+
+
+def _search(query, **filters):
+    index = VerseSearchIndex(VerseStore(VerseStore.pack(ROWS), source="test"))
+    total, matches = index.search(query, **filters)
+    return total, [index.store.verse_at(row).verse_id for row, _ in matches], [score for _, score in matches]
+
+
+def test_parse_query_splits_phrases_and_words():
+    assert parse_query('moses "burning bush"') == [["burning", "bush"], ["moses"]]
+    assert parse_query('"" , !') == []
+    assert tokenize("The LORD's shepherd") == ["the", "lord", "s", "shepherd"]
+
+
+def test_every_clause_must_match():
+    assert _search("moses bush")[:2] == (2, [3, 2])
+    assert _search("moses shepherd")[0] == 0
+    assert _search("unknownword")[0] == 0
+    assert _search("")[0] == 0
+
+
+def test_phrases_match_consecutive_words_only():
+    assert _search('"midst of the bush"')[1] == [3]
+    # Both words occur in verse 1, but not next to each other
+    assert _search('"fire bush"')[0] == 0
+
+
+def test_bm25_ranks_repeated_terms_in_short_verses_first():
+    total, verse_ids, scores = _search("moses")
+    assert (total, verse_ids) == (2, [3, 2])
+    assert scores[0] > scores[1] > 0
+
+
+def test_filters_and_paging():
+    assert _search("bush", version="ASV")[1] == [5]
+    assert _search("bush", version="NIV")[0] == 0
+    assert _search("shepherd", book_name="Exodus")[0] == 0
+
+    total, all_ids, _ = _search("bush")
+    assert total == 4
+    assert _search("bush", offset=1, limit=2)[1] == all_ids[1:3]
@@ -0,0 +1,149 @@
+# tests/test_verse_store.py
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database, models, verse_store as verse_store_module
+from app.bible_reference import PassageRange
+from app.verse_store import VerseStore, VerseStoreHolder
+
+VERSES = [
+    # Inserted out of reading order, the store sorts by book order, chapter and verse
+    ("John", 3, 17, "For God sent not his Son"),
+    ("Genesis", 1, 1, "In the beginning"),
+    ("John", 3, 16, "For God so loved the world"),
+    ("Genesis", 1, 2, "And the earth was without form"),
+]
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """A database of its own, so the store sees exactly the verses of the test."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'verses.db'}")
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add_all(
+            models.BibleVerse(book_name=book, chapter=chapter, verse=verse, text=text, version="KJV")
+            for book, chapter, verse, text in VERSES
+        )
+        session.commit()
+    yield factory
+    engine.dispose()
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_packed_store_lookups(session_factory):
+    with session_factory() as session:
+        store = VerseStore.from_session(session)
+        by_text = {verse.text: verse.verse_id for verse in session.query(models.BibleVerse)}
+
+    assert store.count == 4
+    assert store.get_by_id(by_text["In the beginning"]).book_name == "Genesis"
+    assert store.get_by_id(999) is None
+
+    john = store.get_passage(PassageRange("John", 3, 16, 3, None), "KJV")
+    assert [verse.verse for verse in john] == [16, 17]
+    assert store.get_passage(PassageRange("John", 3, 16, 3, 16), "KJV")[0].text == "For God so loved the world"
+    assert store.get_passage(PassageRange("John", 3, 16, 3, 17), "ASV") == []
+
+
+def test_memory_mapped_file_matches_the_built_store(session_factory, tmp_path):
+    with session_factory() as session:
+        built = VerseStore.from_session(session)
+    path = tmp_path / "verses.bin"
+    path.write_bytes(built._buffer)
+
+    mapped = VerseStore.open(str(path))
+    assert mapped.digest == built.digest
+    assert mapped.content_digest == built.content_digest
+    assert [mapped.verse_at(row) for row in range(mapped.count)] == [built.verse_at(row) for row in range(built.count)]
+
+
+def test_content_digest_catches_edits_that_keep_the_size(session_factory):
+    with session_factory() as session:
+        store = VerseStore.from_session(session)
+        assert store.matches(session)
+
+        session.query(models.BibleVerse).filter(models.BibleVerse.verse == 1).update({models.BibleVerse.text: "Edited"})
+        session.commit()
+        assert store.matches_size(session)
+        assert not store.matches(session)
+
+
+def test_stale_store_file_is_rebuilt_from_the_database(session_factory, tmp_path):
+    with session_factory() as session:
+        path = tmp_path / "verses.bin"
+        path.write_bytes(VerseStore.from_session(session)._buffer)
+        session.query(models.BibleVerse).filter(models.BibleVerse.verse == 1).update({models.BibleVerse.text: "Edited"})
+        session.commit()
+
+    holder = VerseStoreHolder()
+    holder.load(session_factory, path=str(path))
+    assert holder.get().source == "database"
+    assert holder.get().get_passage(PassageRange("Genesis", 1, 1, 1, 1), "KJV")[0].text == "Edited"
+
+
+def test_holder_rebuilds_in_the_background_after_an_out_of_band_insert(session_factory, monkeypatch):
+    holder = VerseStoreHolder()
+    holder.load(session_factory, path=None)
+    assert holder.get().count == 4
+
+    with session_factory() as session:
+        session.add(models.BibleVerse(book_name="John", chapter=3, verse=18, text="He that believeth", version="KJV"))
+        session.commit()
+
+        monkeypatch.setattr(verse_store_module, "VERSE_STORE_CHECK_INTERVAL", 0)
+        # The size check sees the new row, drops the store and starts a rebuild
+        assert holder.current(session) is None
+    _wait_for(lambda: holder.get() is not None)
+    assert holder.get().count == 5
+
+
+def test_empty_database_leaves_the_store_unloaded_until_verses_arrive(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+
+    holder = VerseStoreHolder()
+    holder.load(factory, path=None)
+    assert holder.get() is None
+
+    monkeypatch.setattr(verse_store_module, "VERSE_STORE_CHECK_INTERVAL", 0)
+    with factory() as session:
+        session.add(models.BibleVerse(book_name="Genesis", chapter=1, verse=1, text="In the beginning", version="KJV"))
+        session.commit()
+        assert holder.current(session) is None
+    _wait_for(lambda: holder.get() is not None)
+    assert holder.get().count == 1
+    engine.dispose()
+
+
+def test_passages_missing_from_the_store_are_read_from_the_database(session_factory, monkeypatch):
+    holder = VerseStoreHolder()
+    holder.load(session_factory, path=None)
+    monkeypatch.setattr(database, "verse_store", holder)
+
+    with session_factory() as session:
+        session.add(models.BibleVerse(book_name="Psalms", chapter=23, verse=1, text="The LORD is my shepherd", version="KJV"))
+        session.commit()
+
+        # Within the check interval the store is still served, so the new passage falls back
+        db = database.Database(session=session)
+        psalm = PassageRange("Psalms", 23, 1, 23, 1)
+        john = PassageRange("John", 3, 16, 3, 16)
+        passages = db._read_passages([psalm, john], "KJV")
+        assert [verse.text for verse in passages[psalm]] == ["The LORD is my shepherd"]
+        assert [verse.text for verse in passages[john]] == ["For God so loved the world"]
+        assert db.get_bible_passage(PassageRange("Ruth", 1, 1, 1, 1), "KJV") == []
+
+    # The database had verses the store lacked, so it is rebuilt with them
+    _wait_for(lambda: holder.get() is not None and holder.get().count == 5)
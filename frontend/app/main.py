@@ -1,13 +1,22 @@
 # app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, Form, Depends, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import requests
+import httpx
 from .routers import auth, dashboard, leaderboard, trivia, about_contact
-from .utils import get_current_user, API_BASE_URL
+from .utils import get_current_user, get_optional_user, get_token_from_cookie, backend, user_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await backend.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 # Mount static files
@@ -23,6 +32,7 @@ app.include_router(leaderboard.router)
 app.include_router(trivia.router)
 app.include_router(about_contact.router)
 
+
 # Redirect https to http middleware
 @app.middleware("http")
 async def https_to_http_redirect(request: Request, call_next):
@@ -37,24 +47,19 @@ async def https_to_http_redirect(request: Request, call_next):
     return response
 
 @app.get("/", response_class=HTMLResponse)
-def home(request: Request):
-    token = request.cookies.get("access_token")
-    user = None
-    if token:
-        try:
-            user_response = requests.get(
-                f"{API_BASE_URL}/users/me",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            if user_response.status_code == 200:
-                user = user_response.json()
-        except:
-            pass
+async def home(request: Request):
+    try:
+        user = await get_optional_user(request)
+    except httpx.HTTPError:
+        user = None
     return templates.TemplateResponse("home.html", {"request": request, "user": user})
 
 # Logout route
 @app.get("/logout")
-def logout():
+def logout(request: Request):
+    token = get_token_from_cookie(request)
+    if token:
+        user_cache.evict(token)
     response = RedirectResponse(url="/", status_code=303)
     response.delete_cookie(key="access_token")
     return response
\ No newline at end of file
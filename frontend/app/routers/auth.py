@@ -3,9 +3,9 @@
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import RedirectResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
-import requests
+import httpx
 
-from ..utils import API_BASE_URL
+from ..utils import backend
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
@@ -15,15 +15,15 @@ def register_form(request: Request):
     return templates.TemplateResponse("register.html", {"request": request})
 
 @router.post("/register", response_class=HTMLResponse)
-def register(
+async def register(
     request: Request, 
     username: str = Form(...), 
     password: str = Form(...)
 ):
     data = {"username": username, "password": password}
     try:
-        response = requests.post(f"{API_BASE_URL}/users/register", json=data)
-    except requests.exceptions.RequestException as e:
+        response = await backend.post("/users/register", json=data)
+    except httpx.HTTPError as e:
         return templates.TemplateResponse("register.html", {"request": request, "error": str(e)})
     
     print("Response: ", response.status_code)
@@ -41,9 +41,9 @@ def login_form(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 @router.post("/login", response_class=HTMLResponse)
-def login(request: Request, username: str = Form(...), password: str = Form(...)):
+async def login(request: Request, username: str = Form(...), password: str = Form(...)):
     data = {"username": username, "password": password}
-    response = requests.post(f"{API_BASE_URL}/users/login", data=data)
+    response = await backend.post("/users/login", data=data)
     if response.status_code == 200:
         token = response.json().get("access_token")
         response = RedirectResponse(url="/dashboard", status_code=303)
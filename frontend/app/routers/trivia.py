@@ -2,9 +2,10 @@
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-import requests
+import asyncio
+import time
 
-from ..utils import get_current_user, API_BASE_URL
+from ..utils import get_current_user, get_token_from_cookie, backend
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
@@ -20,80 +21,35 @@ def process_questions(questions):
         ]
     return questions
 
-def get_questions(section_id, headers):
+async def get_questions(section_id, token):
     """Fetch questions for a given section from the API."""
-    response = requests.get(f"{API_BASE_URL}/questions/section/{section_id}", headers=headers)
+    response = await backend.get(f"/questions/section/{section_id}", token=token)
     if response.status_code == 200:
         questions = response.json()
         return process_questions(questions)
     else:
         return []
 
-def submit_answers(section_id, answers, headers):
-    """Submit user's answers to the API and receive feedback."""
+async def finish_attempt(section_id, answers, time_taken, token):
+    """Grade the answers and save the attempt in one backend call. Returns None on failure."""
     payload = {
         "section_id": section_id,
-        "answers": answers
-    }
-    response = requests.post(
-        f"{API_BASE_URL}/progress/submit",
-        json=payload,
-        headers=headers
-    )
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return []
-
-
-def save_score(section_id, score, headers, attempt_number=0, time_taken=0):
-    """Save the user's score to the backend."""
-    payload = {
-        "section_id": section_id,
-        "attempt_number": attempt_number + 1,
-        "score": score,
+        "answers": answers,
         "time_taken": time_taken
     }
-    response = requests.post(
-        f"{API_BASE_URL}/scores/",
+    response = await backend.post(
+        "/scores/finish-attempt",
         json=payload,
-        headers=headers
-    )
-    return response.status_code == 200
-
-def process_feedback(feedback, questions):
-    """Enhance feedback with option texts based on user's answers."""
-    questions_dict = {q['question_id']: q for q in questions}
-    for item in feedback:
-        question_id = item['question_id']
-        question = questions_dict.get(question_id)
-        if question:
-            options = question['options']
-            user_answer_index = item['user_answer'] - 1  # Convert to 0-based index
-            correct_answer_index = item['correct_answer'] - 1
-            item['user_answer_text'] = options[user_answer_index] if 0 <= user_answer_index < len(options) else 'Invalid option'
-            item['correct_answer_text'] = options[correct_answer_index] if 0 <= correct_answer_index < len(options) else 'Invalid option'
-        else:
-            item['user_answer_text'] = 'Question not found'
-            item['correct_answer_text'] = 'Question not found'
-    return feedback
-
-def get_attempt_number(section_id, user_id, headers):
-    """Fetch the current attempt number for the section and user."""
-    response = requests.get(
-        f"{API_BASE_URL}/scores/attempts",
-        params={"section_id": section_id, "user_id": user_id},
-        headers=headers
+        token=token
     )
     if response.status_code == 200:
-        # Assume the response contains an 'attempt_number' field
         return response.json()
-    return 1  # Default to the first attempt if the API does not return data
+    return None
 
 
-def get_section_name(section_id, headers):
+async def get_section_name(section_id, token):
         # Fetch section
-    sections_response = requests.get(f"{API_BASE_URL}/sections/{section_id}", headers=headers)
+    sections_response = await backend.get(f"/sections/{section_id}", token=token)
     if sections_response.status_code == 200:
         section = sections_response.json()
     else:
@@ -105,12 +61,14 @@ def get_section_name(section_id, headers):
 
 
 @router.get("/trivia/{section_id}", response_class=HTMLResponse)
-def trivia_section(request: Request, section_id: int, user: dict = Depends(get_current_user)):
-    headers = {"Authorization": f"Bearer {request.cookies.get('access_token')}"}
-    questions = get_questions(section_id, headers)
+async def trivia_section(request: Request, section_id: int, user: dict = Depends(get_current_user)):
+    token = get_token_from_cookie(request)
     
-    # Get Section Name
-    section_name = get_section_name(section_id, headers)
+    # Get the questions and the section name concurrently
+    questions, section_name = await asyncio.gather(
+        get_questions(section_id, token),
+        get_section_name(section_id, token)
+    )
     
     return templates.TemplateResponse("trivia.html", {
         "request": request,
@@ -119,6 +77,7 @@ def trivia_section(request: Request, section_id: int, user: dict = Depends(get_c
         "questions": questions,
         "user_answers": {},
         "total_questions": len(questions),
+        "started_at": int(time.time()),
     })
     
     
@@ -134,40 +93,46 @@ async def submit_trivia(request: Request, section_id: int, user: dict = Depends(
         if key.startswith("q") and key[1:].isdigit() and value.isdigit()
     }
     
-    headers = {"Authorization": f"Bearer {request.cookies.get('access_token')}"}
-    
-    # Submit answers and get feedback
-    feedback = submit_answers(section_id, user_answers, headers)
-    
-    # Get Section Name
-    section_name = get_section_name(section_id, headers)
-    
-    
-    # Calculate the user's score based on the feedback
-    total_correct = sum(1 for item in feedback if item['result'] == "Correct")
-
-    user_id = user.get("user_id")
+    # Nothing answered, show the quiz again rather than recording an empty attempt
+    if not user_answers:
+        return await trivia_section(request, section_id, user)
     
-    attempt_number = get_attempt_number(section_id=section_id, user_id=user_id, headers=headers)
+    # The quiz page carries the time it was served
+    started_at = form.get("started_at", "")
+    time_taken = max(0, int(time.time()) - int(started_at)) if started_at.isdigit() else 0
     
-    # Save the score
-    save_score(section_id, total_correct, headers, attempt_number=attempt_number)
+    token = get_token_from_cookie(request)
     
-    # Fetch and process questions again for display
-    questions = get_questions(section_id, headers)
-    
-    # Process feedback to include option text
-    feedback = process_feedback(feedback, questions)
+    # Grade, number and save the attempt while fetching the quiz's questions
+    result, questions = await asyncio.gather(
+        finish_attempt(section_id, user_answers, time_taken, token),
+        get_questions(section_id, token)
+    )
+    if result is None:
+        return await trivia_section(request, section_id, user)
+    
+    # Feedback only covers answered questions, unanswered ones are shown without it
+    feedback = {item["question_id"]: item for item in result["feedback"]}
+    if not questions:
+        questions = [
+            {
+                "question_id": item["question_id"],
+                "question_text": item["question_text"],
+                "difficulty": item["difficulty"],
+                "bible_reference": item["bible_reference"],
+                "options": item["options"],
+                "correct_option": item["correct_answer"],
+            }
+            for item in result["feedback"]
+        ]
 
     return templates.TemplateResponse("trivia.html", {
         "request": request,
         "user": user,
-        "section": {"id": section_id, "name": f"Section: {section_name}"},
+        "section": {"id": section_id, "name": f"Section: {result['section_name']}"},
         "questions": questions,
         "feedback": feedback,
         "user_answers": user_answers,
-        "total_correct": total_correct,
-        "total_questions": len(questions),
+        "total_correct": result["score"],
+        "total_questions": result["total_questions"],
     })
-    
-   
\ No newline at end of file
@@ -1,8 +1,15 @@
 # app/utils.py
 from fastapi import Request, HTTPException, Depends
 from fastapi.responses import RedirectResponse
-import requests
+from jose import jwt, JWTError
+from collections import OrderedDict
+from typing import Optional
+import asyncio
+import hashlib
+import httpx
 import os
+import threading
+import time
 
 
 # Load environment variables
@@ -12,21 +19,233 @@ NETWORK_IPV4_ADDRESS_BACKEND = os.getenv('NETWORK_IPV4_ADDRESS_BACKEND')
 API_BASE_URL = f"http://{NETWORK_IPV4_ADDRESS_BACKEND}:8000"  # Change this to your actual API URL
 print("API_BASE_URL: ", API_BASE_URL)
 
+# Backend client tuning
+BACKEND_TIMEOUT = float(os.getenv('BACKEND_TIMEOUT', '10'))  # Seconds, per call
+BACKEND_MAX_CONNECTIONS = int(os.getenv('BACKEND_MAX_CONNECTIONS', '50'))
+BACKEND_MAX_KEEPALIVE = int(os.getenv('BACKEND_MAX_KEEPALIVE', '20'))
+BACKEND_MAX_CONCURRENCY = int(os.getenv('BACKEND_MAX_CONCURRENCY', '50'))  # In-flight calls per process
+BACKEND_ETAG_CACHE_ENTRIES = int(os.getenv('BACKEND_ETAG_CACHE_ENTRIES', '512'))  # Cached GET responses
+
+# How long a resolved user is trusted before /users/me is called again
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '30'))  # Seconds
+USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', '10000'))
+
+
+class ETagCache:
+    """
+    LRU of backend GET responses that carried an ETag, replayed when the backend answers 304.
+
+    Responses marked `Cache-Control: public` are shared by every caller. Anything else is
+    keyed by the caller's token as well, so one user's data is never served to another.
+    """
+
+    def __init__(self, max_entries: int = BACKEND_ETAG_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, httpx.Response]" = OrderedDict()
+
+    @staticmethod
+    def _key(url: str, token: Optional[str]) -> tuple:
+        return url, hashlib.sha256(token.encode("utf-8")).hexdigest() if token else None
+
+    def get(self, url: str, token: Optional[str]) -> Optional[httpx.Response]:
+        for key in (self._key(url, token), self._key(url, None)):
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                return response
+        return None
+
+    def put(self, url: str, token: Optional[str], response: httpx.Response):
+        public = "public" in response.headers.get("cache-control", "")
+        key = self._key(url, None if public else token)
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class BackendClient:
+    """
+    Shared client for the frontend-to-backend hop.
+
+    Wraps one pooled httpx.AsyncClient so connections are kept alive and reused across
+    requests, applies a default timeout that each call may override, and bounds the
+    number of in-flight calls with a semaphore. GET responses with an ETag are kept in
+    an ETagCache and revalidated with If-None-Match, so unchanged bodies are not re-sent.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = BACKEND_TIMEOUT,
+        max_connections: int = BACKEND_MAX_CONNECTIONS,
+        max_keepalive: int = BACKEND_MAX_KEEPALIVE,
+        max_concurrency: int = BACKEND_MAX_CONCURRENCY
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=30
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.etag_cache = ETagCache()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so the client is bound to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        token: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request to the backend, authenticated with `token` when given."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        cached = None
+        if method == "GET":
+            cache_url = str(httpx.URL(path, params=kwargs.get("params")))
+            cached = self.etag_cache.get(cache_url, token)
+            if cached is not None:
+                headers.setdefault("If-None-Match", cached.headers["etag"])
+
+        async with self._semaphore:
+            response = await self.client.request(method, path, headers=headers, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            # The cached body is already decoded, so drop the headers describing the wire form
+            replay_headers = [
+                (name, value) for name, value in cached.headers.items()
+                if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+            ]
+            return httpx.Response(
+                status_code=cached.status_code,
+                headers=replay_headers,
+                content=cached.content,
+                request=response.request
+            )
+        if method == "GET" and response.status_code == 200 and "etag" in response.headers:
+            self.etag_cache.put(cache_url, token, response)
+        return response
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+
+backend = BackendClient(API_BASE_URL)
+
+
+class UserCache:
+    """
+    Short-lived in-process cache of /users/me responses, keyed by a hash of the token.
+
+    An entry lives for `ttl` seconds, or until the token's own `exp` claim if that is
+    sooner, and is evicted on logout or when the backend rejects the token.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _expires_at(self, token: str) -> float:
+        expires_at = time.time() + self.ttl
+        try:
+            # The backend verifies the signature, only the expiry is read here
+            token_exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            token_exp = None
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        return expires_at
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return user
+
+    def put(self, token: str, user: dict):
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (self._expires_at(token), user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, token: str):
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+
+user_cache = UserCache()
+
 
 def get_token_from_cookie(request: Request):
     return request.cookies.get("access_token")
 
-def is_authenticated(token: str):
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{API_BASE_URL}/users/me", headers=headers)
-    return response.status_code == 200
+async def resolve_user(token: str) -> Optional[dict]:
+    """Return the user the token belongs to, or None if the backend rejects it."""
+    user = user_cache.get(token)
+    if user is not None:
+        return user
+    response = await backend.get("/users/me", token=token)
+    if response.status_code != 200:
+        user_cache.evict(token)
+        return None
+    user = response.json()
+    user_cache.put(token, user)
+    return user
+
+async def is_authenticated(token: str):
+    return await resolve_user(token) is not None
 
-def get_current_user(request: Request):
+async def get_optional_user(request: Request) -> Optional[dict]:
+    """Resolve the current user at most once per request; None when not logged in."""
+    if hasattr(request.state, "user"):
+        return request.state.user
     token = get_token_from_cookie(request)
-    if not token or not is_authenticated(token):
+    request.state.user = await resolve_user(token) if token else None
+    return request.state.user
+
+async def get_current_user(request: Request):
+    user = await get_optional_user(request)
+    if user is None:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{API_BASE_URL}/users/me", headers=headers)
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return response.json()
+    return user
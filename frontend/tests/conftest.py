@@ -0,0 +1,23 @@
+# tests/conftest.py
+"""
+Frontend tests, with the backend calls replaced per test.
+
+    cd frontend && python -m pytest tests
+"""
+import os
+
+os.environ.setdefault("NETWORK_IPV4_ADDRESS_BACKEND", "127.0.0.1")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils import get_current_user
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: {"username": "tester", "role": "user"}
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,94 @@
+# tests/test_trivia.py
+import re
+import time
+
+from app.routers import trivia
+
+QUESTIONS = [
+    {
+        "question_id": question_id,
+        "question_text": f"Question {question_id}",
+        "difficulty": "beginner",
+        "bible_reference": "John 3:16",
+        "option1": "a", "option2": "b", "option3": "c", "option4": "d",
+        "correct_option": 1,
+    }
+    for question_id in (1, 2, 3)
+]
+
+
+def _feedback(question_id, answer):
+    return {
+        "question_id": question_id,
+        "question_text": f"Question {question_id}",
+        "user_answer": answer,
+        "correct_answer": 1,
+        "result": "Correct" if answer == 1 else "Incorrect",
+        "explanation": None,
+        "difficulty": "beginner",
+        "bible_reference": "John 3:16",
+        "options": ["a", "b", "c", "d"],
+        "user_answer_text": "abcd"[answer - 1],
+        "correct_answer_text": "a",
+    }
+
+
+def _fake_backend(monkeypatch):
+    calls = []
+
+    async def get_questions(section_id, token):
+        return trivia.process_questions([dict(question) for question in QUESTIONS])
+
+    async def get_section_name(section_id, token):
+        return "Test"
+
+    async def finish_attempt(section_id, answers, time_taken, token):
+        calls.append({"answers": answers, "time_taken": time_taken})
+        feedback = [_feedback(question_id, answer) for question_id, answer in answers.items()]
+        return {
+            "section_name": "Test",
+            "score": sum(item["result"] == "Correct" for item in feedback),
+            "total_questions": len(QUESTIONS),
+            "feedback": feedback,
+        }
+
+    monkeypatch.setattr(trivia, "get_questions", get_questions)
+    monkeypatch.setattr(trivia, "get_section_name", get_section_name)
+    monkeypatch.setattr(trivia, "finish_attempt", finish_attempt)
+    return calls
+
+
+def test_quiz_page_carries_its_start_time(client, monkeypatch):
+    _fake_backend(monkeypatch)
+    before = int(time.time())
+    page = client.get("/trivia/1")
+    started_at = int(re.search(r'name="started_at" value="(\d+)"', page.text).group(1))
+    assert before <= started_at <= int(time.time())
+
+
+def test_submit_sends_time_taken_and_shows_unanswered_questions(client, monkeypatch):
+    calls = _fake_backend(monkeypatch)
+    started_at = int(time.time()) - 42
+
+    page = client.post("/trivia/1", data={"q1": "1", "q2": "2", "started_at": str(started_at)})
+
+    assert calls == [{"answers": {1: 1, 2: 2}, "time_taken": calls[0]["time_taken"]}]
+    assert 42 <= calls[0]["time_taken"] <= 44
+    assert "You answered 1 out of 3 questions correctly" in re.sub(r"\s+", " ", page.text)
+    # Question 3 was not answered but is still shown
+    assert "Question 3" in page.text
+    assert page.text.count("Not answered.") == 1
+
+
+def test_empty_submit_records_nothing(client, monkeypatch):
+    calls = _fake_backend(monkeypatch)
+    page = client.post("/trivia/1", data={"started_at": str(int(time.time()))})
+    assert calls == []
+    assert "Submit Answers" in page.text
+    assert "Quiz Completed" not in page.text
+
+
+def test_missing_start_time_sends_zero(client, monkeypatch):
+    calls = _fake_backend(monkeypatch)
+    client.post("/trivia/1", data={"q1": "1"})
+    assert calls[0]["time_taken"] == 0
@@ -1,9 +1,14 @@
+import argparse
 import asyncio
 import aiohttp
 import json
 import logging
+import random
 import sys
 import os
+import time
+
+from create_account.content_hash import question_content_hash
 
 # Configure logging
 logger = logging.getLogger('BulkUploadLogger')
@@ -50,6 +55,13 @@ if missing_credentials:
     logger.error(f"Missing admin credentials for: {', '.join(missing_credentials)}")
     sys.exit(1)
 
+# Upload tuning
+CHUNK_SIZE = int(os.getenv('QUESTION_CHUNK_SIZE', '200'))  # Questions per bulk request
+INITIAL_CONCURRENCY = int(os.getenv('QUESTION_INITIAL_CONCURRENCY', '2'))
+MAX_CONCURRENCY = int(os.getenv('QUESTION_MAX_CONCURRENCY', '8'))
+MAX_RETRIES = int(os.getenv('QUESTION_MAX_RETRIES', '5'))
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=int(os.getenv('QUESTION_REQUEST_TIMEOUT', '60')))
+
 async def register_admin(session):
     logger.debug("Attempting to register admin user.")
     try:
@@ -149,33 +161,170 @@ async def create_sections(session, headers, sections):
     
     return section_ids
 
-async def create_question(session, headers, question):
-    logger.debug(f"Creating question: {question['question_text']}")
-    try:
+def content_hash_of(question):
+    return question_content_hash(
+        question_text=question["question_text"],
+        option1=question["option1"],
+        option2=question["option2"],
+        option3=question["option3"],
+        option4=question["option4"],
+        correct_option=question["correct_option"],
+        bible_reference=question.get("bible_reference")
+    )
+
+async def get_question_hashes(session, headers):
+    logger.debug("Fetching content hashes of existing questions.")
+    async with session.get(
+        f"{API_BASE_URL}/questions/hashes",
+        headers=headers,
+        timeout=REQUEST_TIMEOUT
+    ) as response:
+        if response.status != 200:
+            text = await response.text()
+            raise RuntimeError(f"Failed to retrieve question hashes. Status: {response.status}, Response: {text}")
+        # The same question may live in two sections, so questions are keyed by both
+        keys = {(item["section_id"], item["content_hash"]) for item in await response.json()}
+    logger.info(f"Server has {len(keys)} active questions.")
+    return keys
+
+async def retire_questions(session, headers, keys):
+    logger.debug(f"Retiring {len(keys)} questions.")
+    retired = 0
+    for start in range(0, len(keys), CHUNK_SIZE):
         async with session.post(
-            f"{API_BASE_URL}/questions/",
-            json=question,
-            headers=headers
+            f"{API_BASE_URL}/questions/retire",
+            json=[
+                {"section_id": section_id, "content_hash": content_hash}
+                for section_id, content_hash in keys[start:start + CHUNK_SIZE]
+            ],
+            headers=headers,
+            timeout=REQUEST_TIMEOUT
         ) as response:
-            if response.status == 201 or response.status == 200:
-                logger.info(f"Question '{question['question_text']}' created successfully.")
-            else:
+            if response.status != 200:
                 text = await response.text()
-                logger.error(f"Failed to create question '{question['question_text']}'. Status: {response.status}, Response: {text}")
-    except Exception as e:
-        logger.exception(f"Exception during creating question '{question['question_text']}': {e}")
+                logger.error(f"Failed to retire questions. Status: {response.status}, Response: {text}")
+                continue
+            retired += (await response.json())["retired"]
+    return retired
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that grows while the server keeps up and halves when it does not.
 
-async def create_questions_from_json(questions_data, session, headers, section_ids):
-    logger.info(f"Starting to create questions from JSON file: {questions_data}")
-    sem = asyncio.Semaphore(10)  # Limit concurrency to 10
+    Additive increase after every `limit` consecutive successes, multiplicative decrease
+    on server errors and timeouts.
+    """
 
-    async def bound_create_question(question):
-        async with sem:
-            await create_question(session, headers, question)
+    def __init__(self, initial, maximum):
+        self.limit = max(1, initial)
+        self.maximum = max(self.limit, maximum)
+        self.in_flight = 0
+        self.successes = 0
+        self.condition = asyncio.Condition()
 
-    tasks = []
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    async def on_success(self):
+        async with self.condition:
+            self.successes += 1
+            if self.successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.successes = 0
+                logger.debug(f"Concurrency raised to {self.limit}.")
+            self.condition.notify_all()
+
+    async def on_overload(self):
+        async with self.condition:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+            logger.info(f"Server under pressure, concurrency lowered to {self.limit}.")
+
+
+class UploadStats:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.requests = 0
+        self.retries = 0
+
+
+async def upload_chunk(session, headers, chunk, limiter, stats):
+    """
+    Send one chunk to the bulk create endpoint.
+
+    5xx responses, timeouts and connection errors are retried with exponential backoff.
+    A rejected chunk (4xx) is split in half and retried, so one bad question only
+    costs itself.
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
+        async with limiter:
+            stats.requests += 1
+            try:
+                async with session.post(
+                    f"{API_BASE_URL}/questions/bulk_create/",
+                    json=chunk,
+                    headers=headers,
+                    timeout=REQUEST_TIMEOUT
+                ) as response:
+                    status = response.status
+                    text = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, text = None, repr(e)
 
+        if status in (200, 201):
+            await limiter.on_success()
+            stats.created += len(chunk)
+            logger.debug(f"Created {len(chunk)} questions.")
+            return
+
+        if status is not None and status < 500:
+            if len(chunk) == 1:
+                stats.failed += 1
+                logger.error(f"Failed to create question '{chunk[0]['question_text']}'. Status: {status}, Response: {text}")
+                return
+            middle = len(chunk) // 2
+            await upload_chunk(session, headers, chunk[:middle], limiter, stats)
+            await upload_chunk(session, headers, chunk[middle:], limiter, stats)
+            return
+
+        await limiter.on_overload()
+        if attempt < MAX_RETRIES:
+            stats.retries += 1
+            delay = min(30, 2 ** attempt) * (0.5 + random.random() / 2)
+            logger.warning(f"Chunk of {len(chunk)} questions failed (Status: {status}, Response: {text}). Retrying in {delay:.1f}s.")
+            await asyncio.sleep(delay)
+
+    stats.failed += len(chunk)
+    logger.error(f"Giving up on a chunk of {len(chunk)} questions after {MAX_RETRIES} attempts.")
+
+async def create_questions_from_json(questions_data, session, headers, section_ids, mode="incremental", retire_missing=None):
+    """
+    Upload the questions of the file, then retire the server's questions that are no
+    longer in it.
+
+    An edited question hashes differently, so it is uploaded as a new question and its
+    old version is left to be retired as missing; a question moved to another section is
+    created there and retired from the old one. Retiring is therefore on by default in
+    incremental mode, and only happens once every upload has succeeded, so a failed run
+    never leaves an edited question without either version.
+
+    :param retire_missing: Retire server questions missing from the file. Defaults to
+                           True in incremental mode and False in full mode.
+    """
+    if retire_missing is None:
+        retire_missing = mode == "incremental"
     logger.info(f"Loaded {len(questions_data)} questions from JSON file.")
+
+    questions = []
     for item in questions_data:
         # Data validation
         if not all([item.get('section_name'), item.get('question_text'),
@@ -195,7 +344,7 @@ async def create_questions_from_json(questions_data, session, headers, section_i
         except ValueError:
             logger.warning(f"Non-integer 'correct_option' for question '{item['question_text']}': {item['correct_option']}.")
             continue
-        question = {
+        questions.append({
             "section_id": section_id,
             "question_text": item['question_text'],
             "option1": item['option1'],
@@ -207,18 +356,60 @@ async def create_questions_from_json(questions_data, session, headers, section_i
             "difficulty": item.get('difficulty', 'medium'),
             "topic": item.get('topic', 'general'),
             "hint": item.get('hint', '')
-        }
-        tasks.append(bound_create_question(question))
-    
+        })
 
-    if tasks:
-        logger.info(f"Creating {len(tasks)} questions concurrently.")
-        await asyncio.gather(*tasks)
-        logger.info("Completed creating questions.")
+    # Drop duplicates within a section of the file, keeping the first occurrence
+    questions_by_key = {}
+    for question in questions:
+        questions_by_key.setdefault((question["section_id"], content_hash_of(question)), question)
+
+    if mode == "incremental" or retire_missing:
+        server_keys = await get_question_hashes(session, headers)
     else:
-        logger.warning("No valid questions to create.")
+        server_keys = set()
+
+    if mode == "incremental":
+        questions = [question for key, question in questions_by_key.items() if key not in server_keys]
+        logger.info(
+            f"{len(questions_by_key)} questions in file, {len(questions_by_key) - len(questions)} unchanged, "
+            f"{len(questions)} new, changed or moved."
+        )
+
+    if questions:
+        stats = await upload_questions(session, headers, questions)
+    else:
+        logger.info("No questions to create.")
+        stats = UploadStats()
+
+    if retire_missing:
+        missing = sorted(server_keys - questions_by_key.keys())
+        if stats.failed:
+            logger.warning(
+                f"Not retiring {len(missing)} questions missing from the file, "
+                f"{stats.failed} questions failed to upload. Fix them and rerun."
+            )
+        elif missing:
+            retired = await retire_questions(session, headers, missing)
+            logger.info(f"Retired {retired} questions no longer in the file.")
 
-async def main():
+async def upload_questions(session, headers, questions):
+    chunks = [questions[start:start + CHUNK_SIZE] for start in range(0, len(questions), CHUNK_SIZE)]
+    logger.info(f"Uploading {len(questions)} questions in {len(chunks)} chunks of up to {CHUNK_SIZE}.")
+
+    limiter = AdaptiveLimiter(INITIAL_CONCURRENCY, MAX_CONCURRENCY)
+    stats = UploadStats()
+    start = time.perf_counter()
+    await asyncio.gather(*(upload_chunk(session, headers, chunk, limiter, stats) for chunk in chunks))
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"Upload summary: {stats.created} created, {stats.failed} failed, "
+        f"{stats.requests} requests, {stats.retries} retries, final concurrency {limiter.limit}, "
+        f"{elapsed:.2f}s ({stats.created / elapsed if elapsed else 0:.0f} rows/s)."
+    )
+    return stats
+
+async def main(args):
     async with aiohttp.ClientSession() as session:
         # Register and login admin
         logger.info("Registering admin user.")
@@ -254,11 +445,40 @@ async def main():
         questions_data = data["questions"]
         
         # Create questions from JSON
-        await create_questions_from_json(questions_data, session, headers, section_ids)
+        await create_questions_from_json(
+            questions_data, session, headers, section_ids,
+            mode=args.mode, retire_missing=args.retire_missing
+        )
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Upload the question bank to the API.")
+    parser.add_argument(
+        "--mode",
+        choices=["incremental", "full"],
+        default="incremental",
+        help="incremental sends only questions the server does not have in their section; full sends every question"
+    )
+    retire = parser.add_mutually_exclusive_group()
+    retire.add_argument(
+        "--retire-missing",
+        dest="retire_missing",
+        action="store_true",
+        default=None,
+        help="retire questions on the server that are no longer in the file, including the old "
+             "versions of edited questions (default in incremental mode)"
+    )
+    retire.add_argument(
+        "--keep-missing",
+        dest="retire_missing",
+        action="store_false",
+        help="leave questions that are no longer in the file active"
+    )
+    return parser.parse_args()
 
 if __name__ == '__main__':
+    args = parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(args))
         logger.info("Bulk upload process completed successfully.")
     except Exception as e:
         logger.exception(f"Unhandled exception in main: {e}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Enum as SqlEnum, Table, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Enum as SqlEnum, Table, DateTime, JSON, Index, UniqueConstraint, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import JSON
 from sqlalchemy.ext.declarative import declarative_base
@@ -19,6 +19,8 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     password_hash = Column(String(128), nullable=False)
     role = Column(SqlEnum(Role), default=Role.user)
+    # Bumped to reject every token issued so far, tokens carry the version they were issued at
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     scores = relationship("Score", back_populates="user")
@@ -60,6 +62,10 @@ class Question(Base):
     bible_reference_end_chapter = Column(Integer, nullable=True)
     bible_reference_start_verse = Column(Integer, nullable=True)
     bible_reference_end_verse = Column(Integer, nullable=True)
+    # SHA-256 of the question's content, see create_account/content_hash.py
+    content_hash = Column(String(64), nullable=True, index=True)
+    # Retired questions are kept for progress history but no longer served
+    is_retired = Column(Boolean, nullable=False, default=False, server_default=false())
     # Relationships
     section = relationship("Section", back_populates="questions")
 
@@ -77,6 +83,43 @@ class Score(Base):
     user = relationship("User", back_populates="scores")
     section = relationship("Section", back_populates="scores")
 
+    __table_args__ = (
+        Index('ix_scores_user_section_attempt', 'user_id', 'section_id', 'attempt_number'),
+    )
+
+
+class UserTotal(Base):
+    __tablename__ = 'user_totals'
+
+    user_id = Column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    total_score = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_user_totals_total_score', 'total_score'),
+    )
+
+
+class SectionUserTotal(Base):
+    __tablename__ = 'section_user_totals'
+
+    section_id = Column(Integer, ForeignKey('sections.section_id'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    total_score = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_section_user_totals_section_total', 'section_id', 'total_score'),
+    )
+
+
+# Attempts per user and section, i.e. the last attempt_number handed out. Bumped in
+# the same transaction as the score insert, so numbering needs no MAX() over scores.
+class SectionUserAttempt(Base):
+    __tablename__ = 'section_user_attempts'
+
+    section_id = Column(Integer, ForeignKey('sections.section_id'), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.user_id'), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
 
 class Progress(Base):
     __tablename__ = 'progresses'
@@ -103,6 +146,12 @@ class BibleVerse(Base):
     text = Column(Text, nullable=False)
     version = Column(String(50), nullable=False)
 
+    __table_args__ = (
+        UniqueConstraint('book_name', 'chapter', 'verse', 'version', name='uq_bible_verses_book_chapter_verse_version'),
+        Index('ix_bible_verses_version_verse_id', 'version', 'verse_id'),
+        Index('ix_bible_verses_version_book_chapter_verse_id', 'version', 'book_name', 'chapter', 'verse_id'),
+    )
+
 
 class SectionCompletion(Base):
     __tablename__ = 'section_completions'
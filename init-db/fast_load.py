@@ -0,0 +1,288 @@
+"""
+Load sections, questions and Bible verses straight into the database.
+
+Skips the API entirely: rows go through SQLAlchemy Core executemany in large chunks,
+so there is no per-row validation model, JSON encoding or HTTP round trip. Use it to
+stand up a fresh environment; content edits on a running site should still go through
+bulk_upload_questions_json.py.
+
+Usage:
+    python fast_load.py --questions data/combined_questions_with_sections.json --verses data/kjv.json
+    python fast_load.py --verses data/kjv.json data/web.json --drop-indexes
+
+Reruns are safe: sections are matched by name, questions whose content hash is already
+active in their section are skipped and verses are inserted with insert-ignore on their
+unique key.
+
+On a database created by an older release, start the backend once or run
+`python -m app.schema_upgrade` first, so existing tables have the current columns.
+
+A running backend serves sections, questions and verses from memory. It picks up the
+new rows within CONTENT_SNAPSHOT_CHECK_INTERVAL and VERSE_STORE_CHECK_INTERVAL seconds,
+or straight away with POST /health/content-snapshot/refresh and
+POST /health/verse-store/refresh.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from create_account.content_hash import question_content_hash
+from create_account.enums import Tag, Difficulty, Topics, BibleBook
+from create_account.models import Base, Section, Question, BibleVerse
+
+# Load environment variables
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+# Loader tuning
+CHUNK_SIZE = int(os.getenv('FAST_LOAD_CHUNK_SIZE', '5000'))  # Rows per executemany
+
+# Tables whose secondary indexes --drop-indexes removes during the load.
+# Unique constraints are kept, the verse dedupe relies on them.
+BULK_TABLES = [Question.__table__, BibleVerse.__table__]
+
+
+def make_engine(database_url):
+    engine = create_engine(database_url)
+    if engine.dialect.name == 'sqlite':
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            # The load is rerunnable, so trade crash durability for speed
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-65536")
+            cursor.close()
+    return engine
+
+
+def insert_ignore(engine, table):
+    """An INSERT for `table` that silently skips rows violating a unique key."""
+    dialect = engine.dialect.name
+    if dialect == 'mysql':
+        return mysql.insert(table).prefix_with('IGNORE')
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return sqlite.insert(table).on_conflict_do_nothing()
+
+
+def drop_secondary_indexes(engine):
+    """Drop the non-unique indexes of the bulk tables, returning them for rebuild."""
+    dropped = []
+    with engine.begin() as conn:
+        for table in BULK_TABLES:
+            for index in table.indexes:
+                if index.unique:
+                    continue
+                index.drop(conn, checkfirst=True)
+                dropped.append(index)
+    print(f"Dropped {len(dropped)} indexes: {', '.join(index.name for index in dropped)}")
+    return dropped
+
+
+def rebuild_indexes(engine, indexes):
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+    print(f"Rebuilt {len(indexes)} indexes in {time.perf_counter() - start:.1f}s")
+
+
+def iter_chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def report(label, count, start):
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0
+    print(f"{label}: {count} rows in {elapsed:.1f}s ({rate:.0f} rows/s)")
+
+
+# ---------------- Sections and Questions ----------------
+
+def load_sections(engine, sections):
+    """Insert missing sections by name and return the name to ID mapping."""
+    rows = [{"name": section["name"], "description": section.get("description")} for section in sections]
+    with engine.begin() as conn:
+        if rows:
+            conn.execute(insert_ignore(engine, Section.__table__), rows)
+        section_ids = dict(conn.execute(select(Section.name, Section.section_id)).all())
+    print(f"{len(section_ids)} sections in the database")
+    return section_ids
+
+
+def question_row(item, section_ids):
+    """Column values for one question from the JSON file. Raises ValueError if invalid."""
+    for field in ('section_name', 'question_text', 'option1', 'option2', 'option3', 'option4', 'correct_option'):
+        if not item.get(field):
+            raise ValueError(f"missing '{field}'")
+    section_id = section_ids.get(item['section_name'])
+    if section_id is None:
+        raise ValueError(f"unknown section '{item['section_name']}'")
+    correct_option = int(item['correct_option'])
+    if correct_option not in (1, 2, 3, 4):
+        raise ValueError(f"correct_option must be 1-4, got {correct_option}")
+    bible_reference = item.get('bible_reference') or ''
+    book = item.get('bible_reference_book')
+    return {
+        "section_id": section_id,
+        "question_text": item['question_text'],
+        "option1": item['option1'],
+        "option2": item['option2'],
+        "option3": item['option3'],
+        "option4": item['option4'],
+        "correct_option": correct_option,
+        "bible_reference": bible_reference,
+        "bible_text": item.get('bible_text'),
+        "difficulty": Difficulty(item.get('difficulty', Difficulty.beginner.value)),
+        "topic": Topics(item['topic']),
+        "tags": [Tag(tag).value for tag in item.get('tags') or []],
+        "hint": item.get('hint'),
+        "bible_reference_book": BibleBook(book) if book else None,
+        "bible_reference_start_chapter": item.get('bible_reference_start_chapter'),
+        "bible_reference_end_chapter": item.get('bible_reference_end_chapter'),
+        "bible_reference_start_verse": item.get('bible_reference_start_verse'),
+        "bible_reference_end_verse": item.get('bible_reference_end_verse'),
+        "content_hash": question_content_hash(
+            question_text=item['question_text'],
+            option1=item['option1'],
+            option2=item['option2'],
+            option3=item['option3'],
+            option4=item['option4'],
+            correct_option=correct_option,
+            bible_reference=bible_reference
+        ),
+        "is_retired": False
+    }
+
+
+def load_questions(engine, file_path, chunk_size):
+    print(f"Loading questions from {file_path}")
+    with open(file_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+
+    section_ids = load_sections(engine, data.get("sections", []))
+
+    with engine.connect() as conn:
+        # The content hash leaves the section out, so the same question may live in two sections
+        known_questions = set(conn.execute(
+            select(Question.section_id, Question.content_hash).where(
+                Question.is_retired == False,
+                Question.content_hash.isnot(None)
+            )
+        ).all())
+
+    rows = []
+    invalid = 0
+    for item in data.get("questions", []):
+        try:
+            row = question_row(item, section_ids)
+        except (KeyError, ValueError) as e:
+            invalid += 1
+            print(f"Skipping question '{item.get('question_text')}': {e}")
+            continue
+        key = (row["section_id"], row["content_hash"])
+        if key in known_questions:
+            continue
+        known_questions.add(key)
+        rows.append(row)
+
+    start = time.perf_counter()
+    statement = insert(Question.__table__)
+    for chunk in iter_chunks(rows, chunk_size):
+        with engine.begin() as conn:
+            conn.execute(statement, chunk)
+    report(f"Questions ({len(data.get('questions', [])) - len(rows) - invalid} already loaded, {invalid} invalid)", len(rows), start)
+
+
+# ---------------- Bible Verses ----------------
+
+def iter_verses(file_path):
+    """Read an NDJSON translation file lazily, one verse per line."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            verse = json.loads(line)
+            yield {
+                "book_name": verse["book_name"],
+                "chapter": verse["chapter"],
+                "verse": verse["verse"],
+                "text": verse["text"],
+                "version": verse["translation_id"]
+            }
+
+
+def count_verses(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(BibleVerse.__table__)).scalar_one()
+
+
+def load_verses(engine, file_path, chunk_size):
+    print(f"Loading verses from {file_path}")
+    before = count_verses(engine)
+    statement = insert_ignore(engine, BibleVerse.__table__)
+    start = time.perf_counter()
+    read = 0
+    for chunk in iter_chunks(iter_verses(file_path), chunk_size):
+        with engine.begin() as conn:
+            conn.execute(statement, chunk)
+        read += len(chunk)
+    created = count_verses(engine) - before
+    report(f"Verses ({read - created} already loaded)", created, start)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load questions and Bible verses directly into the database.")
+    parser.add_argument("--questions", help="combined questions JSON file with 'sections' and 'questions'")
+    parser.add_argument("--verses", nargs="*", default=[], help="NDJSON verse files, one translation per file")
+    parser.add_argument("--database-url", default=DATABASE_URL, help="defaults to $DATABASE_URL")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per executemany")
+    parser.add_argument(
+        "--drop-indexes",
+        action="store_true",
+        help="drop secondary indexes on questions and bible_verses during the load and rebuild them after"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        print("DATABASE_URL is not set and --database-url was not given.")
+        sys.exit(1)
+    if not args.questions and not args.verses:
+        print("Nothing to load, pass --questions and/or --verses.")
+        sys.exit(1)
+
+    engine = make_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+
+    start = time.perf_counter()
+    dropped = drop_secondary_indexes(engine) if args.drop_indexes else []
+    try:
+        if args.questions:
+            load_questions(engine, args.questions, args.chunk_size)
+        for file_path in args.verses:
+            load_verses(engine, file_path, args.chunk_size)
+    finally:
+        if dropped:
+            rebuild_indexes(engine, dropped)
+        engine.dispose()
+    print(f"Finished fast load in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 import requests
 import json
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 print("Running Populate DB")
 # Load environment variables
@@ -14,10 +18,25 @@ ADMIN_USERNAME = os.getenv('ADMIN_USERNAME')
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD')
 
 print(f"ADMIN_USERNAME: {ADMIN_USERNAME}")
-print(f"ADMIN_PASSWORD: {ADMIN_PASSWORD}")
 
-# Path to the JSON file with the verses data
-JSON_FILE_PATH = 'data/kjv.json'
+# NDJSON files with the verses data, one translation per file.
+# Pass paths on the command line to load other translations.
+JSON_FILE_PATHS = sys.argv[1:] or ['data/kjv.json']
+
+# Loader tuning
+CHUNK_SIZE = int(os.getenv('VERSE_CHUNK_SIZE', '1000'))  # Verses per POST
+MAX_PARALLEL_CHUNKS = int(os.getenv('VERSE_MAX_PARALLEL_CHUNKS', '4'))  # Chunks in flight at once
+MAX_RETRIES = int(os.getenv('VERSE_MAX_RETRIES', '3'))
+REQUEST_TIMEOUT = int(os.getenv('VERSE_REQUEST_TIMEOUT', '120'))  # Seconds
+CHECKPOINT_DIR = os.getenv('VERSE_CHECKPOINT_DIR', 'data/.checkpoints')
+
+# One HTTP session per worker thread, so connections are reused
+_thread_local = threading.local()
+
+def get_session():
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
 
 # Function to login and get the access token
 def login(username, password):
@@ -27,73 +46,166 @@ def login(username, password):
         "username": username,
         "password": password
     }
-    
+
     response = requests.post(login_url, data=login_data)
-    
+
     if response.status_code == 200:
         token = response.json().get("access_token")
-        print(f"Login successful. Token received: {token}")
+        print("Login successful.")
         return token
     else:
         print(f"Login failed: {response.status_code}, {response.text}")
         return None
 
-# Function to add verses in batch
-def add_verses_batch(verses, headers):
-    print("Posting Batch")
+
+class Checkpoint:
+    """
+    Records which chunks of a file the API has acknowledged, so a rerun skips them.
+
+    The checkpoint is reset when the file or the chunk size changes, since chunk
+    indices would no longer line up.
+    """
+
+    def __init__(self, file_path, chunk_size):
+        self.path = os.path.join(CHECKPOINT_DIR, os.path.basename(file_path) + ".checkpoint.json")
+        self.identity = {
+            "file": os.path.abspath(file_path),
+            "size": os.path.getsize(file_path),
+            "chunk_size": chunk_size,
+        }
+        self.done = set()
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as file:
+                saved = json.load(file)
+            if saved.get("identity") == self.identity:
+                self.done = set(saved.get("done", []))
+            else:
+                print(f"Checkpoint {self.path} is for a different file or chunk size, starting over.")
+
+    def is_done(self, index):
+        return index in self.done
+
+    def mark_done(self, index):
+        with self._lock:
+            self.done.add(index)
+            os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump({"identity": self.identity, "done": sorted(self.done)}, file)
+            os.replace(tmp_path, self.path)
+
+
+# Read the verses lazily, one NDJSON line at a time
+def iter_verses(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            verse = json.loads(line)
+            # Prepare the data to match the schema expected by the API
+            yield {
+                "book_name": verse["book_name"],
+                "chapter": verse["chapter"],
+                "verse": verse["verse"],
+                "text": verse["text"],
+                "version": verse["translation_id"]
+            }
+
+def iter_chunks(verses, chunk_size):
+    chunk = []
+    index = 0
+    for verse in verses:
+        chunk.append(verse)
+        if len(chunk) == chunk_size:
+            yield index, chunk
+            chunk = []
+            index += 1
+    if chunk:
+        yield index, chunk
+
+# Function to add one chunk of verses, retrying with backoff on failure
+def add_verses_chunk(index, verses, headers):
     bible_batch_url = f"{BASE_URL}/bible/batch"
-    response = requests.post(bible_batch_url, headers=headers, json=verses)
-    
-    if response.status_code == 201:
-        print(f"Successfully added {len(verses)} verses in batch.")
-    else:
-        print(f"Failed to add verses in batch.")
-        print(f"Status Code: {response.status_code}, Response: {response.text}")
-
-# Load the data from the JSON file
-def load_verses_data(file_path):
-    print("Load Verses")
-    with open(file_path, 'r') as file:
-        return [json.loads(line) for line in file]
-
-# Prepare the verses data to match the expected schema
-def prepare_verses_data(raw_data):
-    print("Prepare Verses Data")
-    prepared_data = []
-    for verse in raw_data:
-        prepared_data.append({
-            "book_name": verse["book_name"],
-            "book_id": verse["book_id"],
-            "chapter": verse["chapter"],
-            "verse": verse["verse"],
-            "text": verse["text"],
-            "version": verse["translation_id"]
-        })
-    return prepared_data
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            response = get_session().post(bible_batch_url, headers=headers, json=verses, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 201:
+                return response.json()
+            if response.status_code < 500:
+                raise RuntimeError(f"Chunk {index} rejected: {response.status_code}, {response.text}")
+            error = f"{response.status_code}, {response.text}"
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+        print(f"Chunk {index} failed (attempt {attempt}/{MAX_RETRIES}): {error}")
+        time.sleep(2 ** attempt)
+    raise RuntimeError(f"Chunk {index} failed after {MAX_RETRIES} attempts")
+
+def load_file(file_path, headers):
+    """Stream one NDJSON file to the batch endpoint. Returns the number of failed chunks."""
+    print(f"Loading verses from {file_path}")
+    checkpoint = Checkpoint(file_path, CHUNK_SIZE)
+    if checkpoint.done:
+        print(f"Resuming: {len(checkpoint.done)} chunks already loaded.")
+
+    sent = created = skipped = failed = 0
+    start = time.perf_counter()
+
+    def collect(finished):
+        nonlocal sent, created, skipped, failed
+        for future in finished:
+            index, size = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(e)
+                failed += 1
+                continue
+            checkpoint.mark_done(index)
+            sent += size
+            created += result["created"]
+            skipped += result["skipped"]
+        elapsed = time.perf_counter() - start
+        print(f"{sent} verses acknowledged ({created} created, {skipped} skipped), {sent / elapsed:.0f} verses/s")
+
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS) as pool:
+        for index, chunk in iter_chunks(iter_verses(file_path), CHUNK_SIZE):
+            if checkpoint.is_done(index):
+                continue
+            # Keep at most MAX_PARALLEL_CHUNKS chunks in memory and on the wire
+            if len(in_flight) >= MAX_PARALLEL_CHUNKS:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+            in_flight[pool.submit(add_verses_chunk, index, chunk, headers)] = (index, len(chunk))
+        if in_flight:
+            collect(wait(in_flight).done)
+
+    elapsed = time.perf_counter() - start
+    rate = sent / elapsed if elapsed else 0
+    print(f"Finished {file_path}: {sent} verses in {elapsed:.1f}s ({rate:.0f} verses/s), {created} created, {skipped} skipped, {failed} chunks failed.")
+    return failed
 
 # Main logic
 def main():
     # Step 1: Login and get access token
     token = login(ADMIN_USERNAME, ADMIN_PASSWORD)
-    
+
     if not token:
         print("Exiting script due to login failure.")
-        return
-    
+        sys.exit(1)
+
     # Step 2: Set up headers for authorized requests
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
-    # Step 3: Load the verses data
-    raw_verses_data = load_verses_data(JSON_FILE_PATH)
-    
-    # Step 4: Prepare the data to match the schema expected by the API
-    verses_data = prepare_verses_data(raw_verses_data)
-    
-    # Step 5: Add verses using the batch endpoint
-    add_verses_batch(verses_data, headers)
+    # Step 3: Stream every file to the batch endpoint
+    failed = sum(load_file(file_path, headers) for file_path in JSON_FILE_PATHS)
+    if failed:
+        print(f"{failed} chunks failed. Rerun to resume from the last checkpoint.")
+        sys.exit(1)
 
 
 main()